@@ -0,0 +1,74 @@
+"""Opaque cursors and cached totals for paginated lists."""
+
+import asyncio
+import base64
+import binascii
+import weakref
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(*values: str | int | float) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode("ascii")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises a 400 error if the cursor is malformed or has the wrong number of values.
+    """
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeEncodeError, orjson.JSONDecodeError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ogiltig cursor",
+        )
+    return values
+
+
+class CachedCount:
+    """
+    Row count of a table, counted once per database and then kept up to date.
+
+    Endpoints that insert or delete rows must call adjust() after committing.
+    Writes made outside this process are not seen, so a cached value is
+    reported as not exact.
+    """
+
+    def __init__(self, column: InstrumentedAttribute) -> None:
+        self._column = column
+        self._counts: weakref.WeakKeyDictionary[Engine, int] = weakref.WeakKeyDictionary()
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> tuple[int, bool]:
+        """Return (count, is_exact), running COUNT only on first use."""
+        engine = db.get_bind()
+        count = self._counts.get(engine)
+        if count is not None:
+            return count, False
+
+        async with self._lock:
+            count = self._counts.get(engine)
+            if count is not None:
+                return count, False
+            result = await db.execute(select(func.count(self._column)))
+            count = result.scalar() or 0
+            self._counts[engine] = count
+        return count, True
+
+    def adjust(self, db: AsyncSession, delta: int) -> None:
+        """Apply a committed insert (+1) or delete (-1) to the cached count."""
+        engine = db.get_bind()
+        if engine in self._counts:
+            self._counts[engine] = max(self._counts[engine] + delta, 0)
@@ -81,18 +81,7 @@ async def anonymize_text_endpoint(
                 person_counter: dict[str, int] = {}
 
                 # Build set of enabled entity types
-                entity_types: set[str] = set()
-                ner_config = request.ner_entity_types
-                if ner_config.persons:
-                    entity_types.add("persons")
-                if ner_config.locations:
-                    entity_types.add("locations")
-                if ner_config.organizations:
-                    entity_types.add("organizations")
-                if ner_config.dates:
-                    entity_types.add("dates")
-                if ner_config.events:
-                    entity_types.add("events")
+                entity_types = set(request.ner_entity_types.enabled_types())
 
                 # Count entities before anonymization (only for enabled types)
                 try:
@@ -5,9 +5,10 @@ import tempfile
 from pathlib import Path
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import FileResponse
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -20,14 +21,18 @@ from app.schemas.segment import (
     AudioEditRequest,
     AudioEditResponse,
     EditableTranscriptResponse,
-    SegmentWithWordsResponse,
     WordEditRequest,
     WordEditResponse,
-    WordResponse,
 )
 
 router = APIRouter()
 
+# Ids per UPDATE, below SQLite's bound parameter limit on older builds
+_WORD_ID_BATCH_SIZE = 900
+
+# Keys of WordResponse, in the order the editable transcript query selects them
+_WORD_FIELDS = ("id", "word_index", "start_time", "end_time", "text", "confidence", "included")
+
 
 @router.get("/{job_id}/editable-transcript", response_model=EditableTranscriptResponse)
 async def get_editable_transcript(
@@ -39,13 +44,8 @@ async def get_editable_transcript(
 
     Returns all segments with their words, including the current inclusion state.
     """
-    query = (
-        select(Job)
-        .where(Job.id == job_id)
-        .options(selectinload(Job.segments).selectinload(Segment.words))
-    )
-    result = await db.execute(query)
-    job = result.scalar_one_or_none()
+    query = select(Job.status, Job.file_name, Job.duration_seconds).where(Job.id == job_id)
+    job = (await db.execute(query)).first()
 
     if not job:
         raise HTTPException(
@@ -59,31 +59,51 @@ async def get_editable_transcript(
             detail="Transkriptet är inte klart",
         )
 
-    # Sort segments and their words
-    sorted_segments = sorted(job.segments, key=lambda s: s.segment_index)
-
-    segments_response = []
-    for segment in sorted_segments:
-        sorted_words = sorted(segment.words, key=lambda w: w.word_index)
-        segments_response.append(
-            SegmentWithWordsResponse(
-                id=segment.id,
-                segment_index=segment.segment_index,
-                start_time=segment.start_time,
-                end_time=segment.end_time,
-                text=segment.text,
-                speaker=segment.speaker,
-                words=[WordResponse.model_validate(w) for w in sorted_words],
-            )
+    # Plain column rows shaped into dicts and encoded with orjson; validating
+    # a model per word dominates the request for long interviews
+    segments_query = (
+        select(
+            Segment.id,
+            Segment.segment_index,
+            Segment.start_time,
+            Segment.end_time,
+            Segment.text,
+            Segment.speaker,
         )
-
-    return EditableTranscriptResponse(
-        job_id=job.id,
-        file_name=job.file_name,
-        duration=job.duration_seconds or 0,
-        segments=segments_response,
+        .where(Segment.job_id == job_id)
+        .order_by(Segment.segment_index)
+    )
+    words_query = (
+        select(
+            Word.segment_id,
+            Word.id,
+            Word.word_index,
+            Word.start_time,
+            Word.end_time,
+            Word.text,
+            Word.confidence,
+            Word.included,
+        )
+        .join(Segment, Word.segment_id == Segment.id)
+        .where(Segment.job_id == job_id)
+        .order_by(Word.segment_id, Word.word_index)
     )
 
+    segments = [
+        {**row, "words": []} for row in (await db.execute(segments_query)).mappings()
+    ]
+    words_by_segment = {segment["id"]: segment["words"] for segment in segments}
+    for segment_id, *word in (await db.execute(words_query)).all():
+        words_by_segment[segment_id].append(dict(zip(_WORD_FIELDS, word)))
+
+    content = {
+        "job_id": job_id,
+        "file_name": job.file_name,
+        "duration": job.duration_seconds or 0,
+        "segments": segments,
+    }
+    return Response(orjson.dumps(content), media_type="application/json")
+
 
 @router.post("/{job_id}/words/edit", response_model=WordEditResponse)
 async def update_word_inclusion(
@@ -97,39 +117,37 @@ async def update_word_inclusion(
     Set included=False to mark words for removal in edited audio.
     """
     # Verify job exists
-    job_query = select(Job).where(Job.id == job_id)
-    job_result = await db.execute(job_query)
-    job = job_result.scalar_one_or_none()
-
-    if not job:
+    job_result = await db.execute(select(Job.id).where(Job.id == job_id))
+    if job_result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Jobbet hittades inte",
         )
 
-    # Get words that belong to this job's segments
-    words_query = (
-        select(Word)
-        .join(Segment, Word.segment_id == Segment.id)
-        .where(Segment.job_id == job_id)
-        .where(Word.id.in_(request.word_ids))
-    )
-    result = await db.execute(words_query)
-    words = result.scalars().all()
+    # Update the words that belong to this job's segments, one UPDATE per
+    # batch of ids instead of loading and flushing every word
+    job_segments = select(Segment.id).where(Segment.job_id == job_id)
+    word_ids = list(dict.fromkeys(request.word_ids))
+    updated_count = 0
+    for i in range(0, len(word_ids), _WORD_ID_BATCH_SIZE):
+        result = await db.execute(
+            update(Word)
+            .where(Word.id.in_(word_ids[i : i + _WORD_ID_BATCH_SIZE]))
+            .where(Word.segment_id.in_(job_segments))
+            .values(included=request.included)
+            .execution_options(synchronize_session=False)
+        )
+        updated_count += result.rowcount
 
-    if not words:
+    if not updated_count:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Inga ord hittades",
         )
 
-    # Update inclusion status
-    for word in words:
-        word.included = request.included
-
     await db.commit()
 
-    return WordEditResponse(updated_count=len(words))
+    return WordEditResponse(updated_count=updated_count)
 
 
 @router.get("/{job_id}/download-edited-audio")
@@ -174,12 +192,9 @@ async def download_edited_audio(
     # Collect time ranges to KEEP (where words are included)
     keep_ranges: list[tuple[float, float]] = []
 
-    sorted_segments = sorted(job.segments, key=lambda s: s.segment_index)
-
-    for segment in sorted_segments:
-        sorted_words = sorted(segment.words, key=lambda w: w.word_index)
-
-        if not sorted_words:
+    # Job.segments and Segment.words are loaded in order by the relationships' order_by
+    for segment in job.segments:
+        if not segment.words:
             # No word-level data, use segment level
             keep_ranges.append((segment.start_time, segment.end_time))
             continue
@@ -188,7 +203,7 @@ async def download_edited_audio(
         current_start: float | None = None
         current_end: float | None = None
 
-        for word in sorted_words:
+        for word in segment.words:
             if word.included:
                 if current_start is None:
                     current_start = word.start_time
@@ -292,18 +307,12 @@ async def generate_edited_audio(
             word.included = False
         await db.commit()
 
-        # Refresh job data
-        await db.refresh(job)
-
     # Collect time ranges to KEEP (where words are included)
     keep_ranges: list[tuple[float, float]] = []
 
-    sorted_segments = sorted(job.segments, key=lambda s: s.segment_index)
-
-    for segment in sorted_segments:
-        sorted_words = sorted(segment.words, key=lambda w: w.word_index)
-
-        if not sorted_words:
+    # Job.segments and Segment.words are loaded in order by the relationships' order_by
+    for segment in job.segments:
+        if not segment.words:
             # No word-level data, use segment level
             keep_ranges.append((segment.start_time, segment.end_time))
             continue
@@ -312,7 +321,7 @@ async def generate_edited_audio(
         current_start: float | None = None
         current_end: float | None = None
 
-        for word in sorted_words:
+        for word in segment.words:
             if word.included:
                 if current_start is None:
                     current_start = word.start_time
@@ -1,15 +1,18 @@
 """Export endpoints."""
 
-from pathlib import Path
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
-from sqlalchemy import select
+import io
+import os
+from collections.abc import Iterator, Sequence
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.db.database import get_db
 from app.models.job import Job, JobStatus
+from app.models.segment import Segment
 
 router = APIRouter()
 
@@ -24,11 +27,17 @@ AUDIO_MIME_TYPES = {
 }
 
 
+def _split_timestamp(seconds: float) -> tuple[int, int, int, int]:
+    """Split seconds into (hours, minutes, seconds, milliseconds) using integer math."""
+    hours, rest = divmod(int(seconds * 1000), 3_600_000)
+    minutes, rest = divmod(rest, 60_000)
+    secs, millis = divmod(rest, 1000)
+    return hours, minutes, secs, millis
+
+
 def format_timestamp(seconds: float) -> str:
     """Format seconds as HH:MM:SS."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    hours, minutes, secs, _ = _split_timestamp(seconds)
     if hours > 0:
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     return f"{minutes:02d}:{secs:02d}"
@@ -52,7 +61,7 @@ async def export_transcript(
     Parameters:
     - anonymized: If true, use anonymized_text instead of original text
     """
-    query = select(Job).where(Job.id == job_id).options(selectinload(Job.segments))
+    query = select(Job).where(Job.id == job_id)
     result = await db.execute(query)
     job = result.scalar_one_or_none()
 
@@ -68,18 +77,18 @@ async def export_transcript(
             detail=f"Transkriptet ar inte klart. Status: {job.status.value}",
         )
 
-    sorted_segments = sorted(job.segments, key=lambda s: s.segment_index)
+    rows = (await db.execute(_export_rows_query(job_id, anonymized))).all()
 
     if format == "txt":
-        return export_as_text(job, sorted_segments, anonymized)
+        return export_as_text(job, rows)
     elif format == "md":
-        return export_as_markdown(job, sorted_segments, anonymized)
+        return export_as_markdown(job, rows)
     elif format == "json":
-        return export_as_json(job, sorted_segments, anonymized)
+        return export_as_json(job, rows, anonymized)
     elif format == "srt":
-        return export_as_srt(job, sorted_segments, anonymized)
+        return export_as_srt(job, rows)
     elif format == "vtt":
-        return export_as_vtt(job, sorted_segments, anonymized)
+        return export_as_vtt(job, rows)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -90,103 +99,142 @@ async def export_transcript(
 @router.get("/{job_id}/audio")
 async def get_audio(
     job_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> FileResponse:
+) -> Response:
     """
     Stream the audio file for a job.
 
-    Returns the original uploaded audio file for playback.
+    Returns the original uploaded audio file for playback, or 304 if the
+    browser already has the current version (If-None-Match).
     """
-    query = select(Job).where(Job.id == job_id)
+    # Only the two columns needed; called on every seek, so skip the ORM object
+    query = select(Job.file_path, Job.file_name).where(Job.id == job_id)
     result = await db.execute(query)
-    job = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not job:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Jobbet hittades inte",
         )
+    file_path, file_name = row
 
-    # Get the audio file path
-    file_path = Path(job.file_path)
-    if not file_path.exists():
+    # Stat once and hand the result to FileResponse so it doesn't stat again
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ljudfilen hittades inte",
         )
 
+    # Strong validator from mtime and size; uploads are never modified in place
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
     # Determine MIME type
-    ext = file_path.suffix.lower()
+    ext = os.path.splitext(file_path)[1].lower()
     media_type = AUDIO_MIME_TYPES.get(ext, "audio/mpeg")
 
+    # FileResponse answers Range requests (Accept-Ranges: bytes), so the
+    # player can seek without downloading the whole file
     return FileResponse(
         path=file_path,
         media_type=media_type,
-        filename=job.file_name,
+        filename=file_name,
+        stat_result=stat_result,
+        headers=cache_headers,
     )
 
 
-def get_segment_text(segment, anonymized: bool) -> str:
-    """Get text from segment, using anonymized version if requested and available."""
-    if anonymized and segment.anonymized_text:
-        return segment.anonymized_text
-    return segment.text
+# (index, start, end, speaker, text, confidence)
+ExportRow = tuple[int, float, float, str | None, str, float | None]
+
 
+def _export_rows_query(job_id: str, anonymized: bool) -> Select:
+    """
+    Select the export rows for a job as plain tuples, shared by all formatters.
 
-def export_as_text(job: Job, segments: list, anonymized: bool = False) -> PlainTextResponse:
+    The text is the anonymized version if requested and available.
+    """
+    text = Segment.text
+    if anonymized:
+        text = func.coalesce(func.nullif(Segment.anonymized_text, ""), Segment.text)
+    return (
+        select(
+            Segment.segment_index,
+            Segment.start_time,
+            Segment.end_time,
+            Segment.speaker,
+            text,
+            Segment.confidence,
+        )
+        .where(Segment.job_id == job_id)
+        .order_by(Segment.segment_index)
+    )
+
+
+def export_as_text(job: Job, rows: Sequence[ExportRow]) -> Response:
     """Export as plain text."""
-    lines = [
-        f"Transkription: {job.file_name}",
-        f"Datum: {job.created_at.strftime('%Y-%m-%d %H:%M')}",
-        f"Modell: {job.model}",
-        "",
-        "-" * 50,
-        "",
-    ]
-
-    for segment in segments:
-        timestamp = format_timestamp(segment.start_time)
-        speaker = f"[{segment.speaker}] " if segment.speaker else ""
-        text = get_segment_text(segment, anonymized)
-        lines.append(f"[{timestamp}] {speaker}{text}")
-
-    return PlainTextResponse(
-        content="\n".join(lines),
+    buf = io.BytesIO()
+    w = buf.write
+    header = (
+        f"Transkription: {job.file_name}\n"
+        f"Datum: {job.created_at.strftime('%Y-%m-%d %H:%M')}\n"
+        f"Modell: {job.model}\n"
+        "\n"
+        f"{'-' * 50}\n"
+    )
+    w(header.encode())
+
+    for _, start, _, speaker, text, _ in rows:
+        prefix = f"[{speaker}] " if speaker else ""
+        w(f"\n[{format_timestamp(start)}] {prefix}{text}".encode())
+
+    return Response(
+        content=buf.getvalue(),
+        media_type="text/plain",
         headers={
             "Content-Disposition": f'attachment; filename="{job.file_name}.txt"'
         },
     )
 
 
-def export_as_markdown(job: Job, segments: list, anonymized: bool = False) -> PlainTextResponse:
+def export_as_markdown(job: Job, rows: Sequence[ExportRow]) -> Response:
     """Export as Markdown."""
-    lines = [
-        f"# Transkription: {job.file_name}",
-        "",
-        f"**Datum:** {job.created_at.strftime('%Y-%m-%d %H:%M')}",
-        f"**Modell:** {job.model}",
-        f"**Längd:** {format_timestamp(job.duration_seconds or 0)}",
-        "",
-        "---",
-        "",
-        "## Transkript",
-        "",
-    ]
+    buf = io.BytesIO()
+    w = buf.write
+    header = (
+        f"# Transkription: {job.file_name}\n"
+        "\n"
+        f"**Datum:** {job.created_at.strftime('%Y-%m-%d %H:%M')}\n"
+        f"**Modell:** {job.model}\n"
+        f"**Längd:** {format_timestamp(job.duration_seconds or 0)}\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## Transkript\n"
+    )
+    w(header.encode())
 
     current_speaker = None
-    for segment in segments:
-        timestamp = format_timestamp(segment.start_time)
-        text = get_segment_text(segment, anonymized)
-
+    for _, start, _, speaker, text, _ in rows:
         # Add speaker header if changed
-        if segment.speaker and segment.speaker != current_speaker:
-            current_speaker = segment.speaker
-            lines.append(f"\n### {current_speaker}\n")
+        if speaker and speaker != current_speaker:
+            current_speaker = speaker
+            w(f"\n\n### {current_speaker}\n".encode())
 
-        lines.append(f"**[{timestamp}]** {text}")
+        w(f"\n**[{format_timestamp(start)}]** {text}".encode())
 
-    return PlainTextResponse(
-        content="\n".join(lines),
+    return Response(
+        content=buf.getvalue(),
         media_type="text/markdown",
         headers={
             "Content-Disposition": f'attachment; filename="{job.file_name}.md"'
@@ -194,35 +242,42 @@ def export_as_markdown(job: Job, segments: list, anonymized: bool = False) -> Pl
     )
 
 
-def export_as_json(job: Job, segments: list, anonymized: bool = False) -> JSONResponse:
-    """Export as structured JSON."""
-    data = {
+def export_as_json(job: Job, rows: Sequence[ExportRow], anonymized: bool) -> StreamingResponse:
+    """Export as structured JSON, encoding one segment at a time."""
+    header = {
         "job_id": job.id,
         "file_name": job.file_name,
         "created_at": job.created_at.isoformat(),
         "model": job.model,
         "duration_seconds": job.duration_seconds,
         "anonymized": anonymized,
-        "segments": [
-            {
-                "index": s.segment_index,
-                "start": s.start_time,
-                "end": s.end_time,
-                "text": get_segment_text(s, anonymized),
-                "speaker": s.speaker,
-                "confidence": s.confidence,
-            }
-            for s in segments
-        ],
-        "metadata": {
-            "speaker_count": job.speaker_count,
-            "word_count": job.word_count,
-            "segment_count": len(segments),
-        },
+    }
+    metadata = {
+        "speaker_count": job.speaker_count,
+        "word_count": job.word_count,
+        "segment_count": len(rows),
     }
 
-    return JSONResponse(
-        content=data,
+    def generate() -> Iterator[bytes]:
+        # Open the top-level object and leave it unclosed for the segments array
+        yield orjson.dumps(header)[:-1] + b',"segments":['
+        for i, (idx, start, end, speaker, text, confidence) in enumerate(rows):
+            item = orjson.dumps(
+                {
+                    "index": idx,
+                    "start": start,
+                    "end": end,
+                    "text": text,
+                    "speaker": speaker,
+                    "confidence": confidence,
+                }
+            )
+            yield b"," + item if i else item
+        yield b'],"metadata":' + orjson.dumps(metadata) + b"}"
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/json",
         headers={
             "Content-Disposition": f'attachment; filename="{job.file_name}.json"'
         },
@@ -231,42 +286,34 @@ def export_as_json(job: Job, segments: list, anonymized: bool = False) -> JSONRe
 
 def format_srt_timestamp(seconds: float) -> str:
     """Format seconds as SRT timestamp: HH:MM:SS,mmm."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
+    hours, minutes, secs, millis = _split_timestamp(seconds)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
 def format_vtt_timestamp(seconds: float) -> str:
     """Format seconds as VTT timestamp: HH:MM:SS.mmm."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
+    hours, minutes, secs, millis = _split_timestamp(seconds)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
 
 
-def export_as_srt(job: Job, segments: list, anonymized: bool = False) -> PlainTextResponse:
+def export_as_srt(job: Job, rows: Sequence[ExportRow]) -> Response:
     """Export as SRT subtitle format."""
-    lines = []
-
-    for i, segment in enumerate(segments, start=1):
-        start_time = format_srt_timestamp(segment.start_time)
-        end_time = format_srt_timestamp(segment.end_time)
-        text = get_segment_text(segment, anonymized)
+    buf = io.BytesIO()
+    w = buf.write
+    # Bound once; entries after the first are preceded by an empty line
+    entry = "{}{}\n{} --> {}\n{}\n".format
+    sep = ""
 
+    for i, (_, start, end, speaker, text, _) in enumerate(rows, start=1):
         # Add speaker prefix if available
-        if segment.speaker:
-            text = f"[{segment.speaker}] {text}"
+        if speaker:
+            text = f"[{speaker}] {text}"
 
-        lines.append(str(i))
-        lines.append(f"{start_time} --> {end_time}")
-        lines.append(text)
-        lines.append("")  # Empty line between entries
+        w(entry(sep, i, format_srt_timestamp(start), format_srt_timestamp(end), text).encode())
+        sep = "\n"
 
-    return PlainTextResponse(
-        content="\n".join(lines),
+    return Response(
+        content=buf.getvalue(),
         media_type="text/plain",
         headers={
             "Content-Disposition": f'attachment; filename="{job.file_name}.srt"'
@@ -274,26 +321,23 @@ def export_as_srt(job: Job, segments: list, anonymized: bool = False) -> PlainTe
     )
 
 
-def export_as_vtt(job: Job, segments: list, anonymized: bool = False) -> PlainTextResponse:
+def export_as_vtt(job: Job, rows: Sequence[ExportRow]) -> Response:
     """Export as WebVTT subtitle format."""
-    lines = ["WEBVTT", ""]  # VTT header
-
-    for i, segment in enumerate(segments, start=1):
-        start_time = format_vtt_timestamp(segment.start_time)
-        end_time = format_vtt_timestamp(segment.end_time)
-        text = get_segment_text(segment, anonymized)
+    buf = io.BytesIO()
+    w = buf.write
+    w(b"WEBVTT\n")  # VTT header
+    # Bound once; each entry is preceded by an empty line
+    entry = "\n{}\n{} --> {}\n{}\n".format
 
+    for i, (_, start, end, speaker, text, _) in enumerate(rows, start=1):
         # Add speaker prefix if available
-        if segment.speaker:
-            text = f"<v {segment.speaker}>{text}"
+        if speaker:
+            text = f"<v {speaker}>{text}"
 
-        lines.append(str(i))
-        lines.append(f"{start_time} --> {end_time}")
-        lines.append(text)
-        lines.append("")  # Empty line between entries
+        w(entry(i, format_vtt_timestamp(start), format_vtt_timestamp(end), text).encode())
 
-    return PlainTextResponse(
-        content="\n".join(lines),
+    return Response(
+        content=buf.getvalue(),
         media_type="text/vtt",
         headers={
             "Content-Disposition": f'attachment; filename="{job.file_name}.vtt"'
@@ -1,24 +1,39 @@
 """Job management endpoints."""
 
+import asyncio
+import os
+from collections.abc import AsyncIterator
 from datetime import datetime
 from pathlib import Path
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Select,
+    exists,
+    func,
+    literal_column,
+    select,
+    table,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.api.pagination import CachedCount, decode_cursor, encode_cursor
 from app.config import settings
-from app.db.database import get_db
+from app.db.database import get_db, get_session_maker, is_segment_fts_enabled
 from app.models.job import Job
 from app.models.job import JobStatus as DBJobStatus
+from app.schemas.fast import from_row
 from app.schemas.job import JobCreate, JobListResponse, JobResponse, JobUpdate
 from app.models.segment import Segment
 from app.schemas.segment import (
     EnhancedAnonymizationRequest,
     EnhancedAnonymizationResponse,
-    EnhancedSegmentResponse,
     SearchResponse,
     SearchResultJob,
     SearchResultSegment,
@@ -26,54 +41,80 @@ from app.schemas.segment import (
     SegmentUpdate,
     SpeakerRename,
     SpeakerRenameResponse,
-    TranscriptMetadata,
     TranscriptResponse,
 )
 from app.services.anonymization import (
-    enhanced_anonymize_segments,
-    anonymize_segments as run_ner_anonymization,
+    enhanced_anonymize_texts,
+    anonymize_texts as run_ner_anonymization,
     is_anonymization_available,
 )
 from app.workers.transcription_worker import process_transcription_job
 
 router = APIRouter()
 
+# Total shown in the job list, kept in memory instead of counting every page load
+_job_count = CachedCount(Job.id)
+
 ALLOWED_EXTENSIONS = {".mp3", ".wav", ".m4a", ".ogg", ".flac", ".webm"}
 
+# Columns of JobResponse, for read-only queries that need no ORM objects
+_JOB_RESPONSE_COLUMNS = tuple(getattr(Job, name) for name in JobResponse.model_fields)
+
+# Columns of SegmentResponse, selected directly when ORM objects are not needed
+_SEGMENT_RESPONSE_COLUMNS = (
+    Segment.id,
+    Segment.segment_index,
+    Segment.start_time,
+    Segment.end_time,
+    Segment.text,
+    Segment.anonymized_text,
+    Segment.speaker,
+    Segment.confidence,
+)
+
+# Segments fetched and encoded per chunk when streaming a transcript
+_TRANSCRIPT_BATCH_SIZE = 500
+
+
+async def _fetch_all(session_maker: async_sessionmaker[AsyncSession], query: Select) -> list[Row]:
+    """Run a read query in a short-lived session of its own."""
+    async with session_maker() as session:
+        return list((await session.execute(query)).all())
+
+
+def _json_response(content: dict) -> Response:
+    """
+    Encode an already-shaped payload with orjson.
+
+    Used for large transcript payloads where building a Pydantic model per
+    segment only to serialize it again dominates the request time.
+    """
+    return Response(orjson.dumps(content), media_type="application/json")
+
 
 def find_uploaded_file(file_id: str) -> Path | None:
     """Find an uploaded file by ID."""
-    for ext in ALLOWED_EXTENSIONS:
-        file_path = settings.upload_dir / f"{file_id}{ext}"
-        if file_path.exists():
-            return file_path
+    # One directory scan instead of probing each extension with stat()
+    try:
+        with os.scandir(settings.upload_dir) as entries:
+            for entry in entries:
+                if (
+                    entry.name.startswith(file_id)
+                    and entry.name[len(file_id):] in ALLOWED_EXTENSIONS
+                    and entry.is_file()
+                ):
+                    return Path(entry.path)
+    except FileNotFoundError:
+        pass
     return None
 
 
-def ner_config_to_string(config) -> str | None:
-    """Convert NER entity types config to comma-separated string."""
-    if config is None:
-        return None
-    enabled = []
-    if config.persons:
-        enabled.append("persons")
-    if config.locations:
-        enabled.append("locations")
-    if config.organizations:
-        enabled.append("organizations")
-    if config.dates:
-        enabled.append("dates")
-    if config.events:
-        enabled.append("events")
-    return ",".join(enabled) if enabled else None
-
-
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
     job_data: JobCreate,
     background_tasks: BackgroundTasks,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> Job:
+) -> JobResponse:
     """Create a new transcription job."""
     # Find the uploaded file
     file_path = find_uploaded_file(job_data.file_id)
@@ -83,9 +124,6 @@ async def create_job(
             detail="Den uppladdade filen hittades inte. Ladda upp filen igen.",
         )
 
-    # Convert NER entity types config to string for storage
-    ner_entity_types_str = ner_config_to_string(job_data.ner_entity_types)
-
     # Generate default name if not provided
     name = job_data.name
     if not name:
@@ -101,51 +139,88 @@ async def create_job(
         model=job_data.model,
         enable_diarization=job_data.enable_diarization,
         enable_anonymization=job_data.enable_anonymization,
+        enable_word_timestamps=job_data.enable_word_timestamps,
         language=job_data.language,
-        ner_entity_types=ner_entity_types_str,
+        ner_entity_types=(
+            job_data.ner_entity_types.model_dump() if job_data.ner_entity_types else None
+        ),
         status=DBJobStatus.PENDING,
         current_step="queued",
     )
 
     db.add(job)
     await db.commit()
-    await db.refresh(job)
+    _job_count.adjust(db, 1)
 
     # Start background processing
     background_tasks.add_task(process_transcription_job, job.id)
 
-    return job
+    return from_row(JobResponse, job)
 
 
 @router.get("", response_model=JobListResponse)
 async def list_jobs(
     db: Annotated[AsyncSession, Depends(get_db)],
-    skip: int = 0,
-    limit: int = 20,
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
 ) -> JobListResponse:
-    """List all transcription jobs, newest first."""
-    # Get total count
-    count_query = select(func.count(Job.id))
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Get jobs
-    query = select(Job).order_by(Job.created_at.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    jobs = result.scalars().all()
+    """
+    List all transcription jobs, newest first.
 
-    return JobListResponse(jobs=list(jobs), total=total)
+    Pass next_cursor from the previous page as cursor to continue; skip is
+    only used when no cursor is given.
+    """
+    # Get jobs as plain rows, one extra to know whether there is a next page
+    query = (
+        select(*_JOB_RESPONSE_COLUMNS)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, job_id = decode_cursor(cursor, 2)
+        try:
+            after = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Ogiltig cursor",
+            )
+        query = query.where(tuple_(Job.created_at, Job.id) < tuple_(after, job_id))
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query)
+    jobs = list(result.all())
+
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        last = jobs[-1]
+        next_cursor = encode_cursor(last.created_at.isoformat(), last.id)
+
+    # A short first page already holds every job, no need to count
+    if not cursor and skip == 0 and next_cursor is None:
+        total, total_is_exact = len(jobs), True
+    else:
+        total, total_is_exact = await _job_count.get(db)
+
+    return JobListResponse(
+        jobs=[from_row(JobResponse, job) for job in jobs],
+        total=total,
+        total_is_exact=total_is_exact,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: str,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> Job:
+) -> JobResponse:
     """Get a specific job by ID."""
-    query = select(Job).where(Job.id == job_id)
+    query = select(*_JOB_RESPONSE_COLUMNS).where(Job.id == job_id)
     result = await db.execute(query)
-    job = result.scalar_one_or_none()
+    job = result.one_or_none()
 
     if not job:
         raise HTTPException(
@@ -153,7 +228,7 @@ async def get_job(
             detail="Jobbet hittades inte",
         )
 
-    return job
+    return from_row(JobResponse, job)
 
 
 @router.patch("/{job_id}", response_model=JobResponse)
@@ -161,7 +236,7 @@ async def update_job(
     job_id: str,
     update: JobUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> Job:
+) -> JobResponse:
     """Update a job's name."""
     query = select(Job).where(Job.id == job_id)
     result = await db.execute(query)
@@ -177,20 +252,31 @@ async def update_job(
         job.name = update.name
 
     await db.commit()
-    await db.refresh(job)
 
-    return job
+    return from_row(JobResponse, job)
 
 
 @router.get("/{job_id}/transcript", response_model=TranscriptResponse)
 async def get_transcript(
     job_id: str,
     db: Annotated[AsyncSession, Depends(get_db)],
+    session_maker: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_maker)],
 ) -> TranscriptResponse:
     """Get the transcript for a completed job."""
-    query = select(Job).where(Job.id == job_id).options(selectinload(Job.segments))
-    result = await db.execute(query)
-    job = result.scalar_one_or_none()
+    query = select(Job.status, Job.duration_seconds, Job.word_count).where(Job.id == job_id)
+
+    # Segment and speaker counts are aggregated by SQLite; the word count is the
+    # one the worker stored, counted with str.split()
+    metadata_query = select(
+        func.count(),
+        func.count(func.distinct(Segment.speaker)),
+    ).where(Segment.job_id == job_id)
+
+    # The job lookup and the aggregate are independent, run them side by side
+    job_result, metadata_rows = await asyncio.gather(
+        db.execute(query), _fetch_all(session_maker, metadata_query)
+    )
+    job = job_result.first()
 
     if not job:
         raise HTTPException(
@@ -204,24 +290,37 @@ async def get_transcript(
             detail=f"Transkriptet ar inte klart. Status: {job.status.value}",
         )
 
-    # Sort segments by index
-    sorted_segments = sorted(job.segments, key=lambda s: s.segment_index)
-
-    # Calculate metadata
-    speakers = set(s.speaker for s in sorted_segments if s.speaker)
-    word_count = sum(len(s.text.split()) for s in sorted_segments)
-
-    return TranscriptResponse(
-        job_id=job.id,
-        segments=[SegmentResponse.model_validate(s) for s in sorted_segments],
-        metadata=TranscriptMetadata(
-            total_duration=job.duration_seconds or 0,
-            speaker_count=len(speakers),
-            word_count=word_count,
-            segment_count=len(sorted_segments),
-        ),
+    segment_count, speaker_count = metadata_rows[0]
+    metadata = {
+        "total_duration": job.duration_seconds or 0,
+        "speaker_count": speaker_count,
+        "word_count": job.word_count or 0,
+        "segment_count": segment_count,
+    }
+
+    # Plain column rows streamed from a server-side cursor, one batch at a time
+    segments_query = (
+        select(*_SEGMENT_RESPONSE_COLUMNS)
+        .where(Segment.job_id == job_id)
+        .order_by(Segment.segment_index)
+        .execution_options(yield_per=_TRANSCRIPT_BATCH_SIZE)
     )
 
+    # The generator runs after this handler has returned, when the request
+    # session may already be closed, so it streams from a session of its own
+    async def generate() -> AsyncIterator[bytes]:
+        yield b'{"job_id":' + orjson.dumps(job_id) + b',"segments":['
+        first = True
+        async with session_maker() as session:
+            result = await session.stream(segments_query)
+            async for batch in result.mappings().partitions():
+                chunk = b",".join(orjson.dumps(dict(row)) for row in batch)
+                yield chunk if first else b"," + chunk
+                first = False
+        yield b'],"metadata":' + orjson.dumps(metadata) + b"}"
+
+    return StreamingResponse(generate(), media_type="application/json")
+
 
 @router.delete("/{job_id}")
 async def delete_job(
@@ -247,6 +346,7 @@ async def delete_job(
     # Delete job (cascade deletes segments)
     await db.delete(job)
     await db.commit()
+    _job_count.adjust(db, -1)
 
     return {"status": "deleted", "job_id": job_id}
 
@@ -256,6 +356,7 @@ async def enhance_anonymization(
     job_id: str,
     request: EnhancedAnonymizationRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
+    session_maker: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_maker)],
 ) -> EnhancedAnonymizationResponse:
     """
     Apply enhanced pattern-based anonymization to a completed job's transcript.
@@ -264,35 +365,45 @@ async def enhance_anonymization(
     It applies regex patterns to catch institution names, personnummer, phone
     numbers, and other sensitive data that KB-BERT NER might have missed.
     """
-    query = select(Job).where(Job.id == job_id).options(selectinload(Job.segments))
-    result = await db.execute(query)
-    job = result.scalar_one_or_none()
+    # Load segment columns; only the source texts are handed to the anonymizer
+    segments_query = (
+        select(
+            Segment.segment_index,
+            Segment.start_time,
+            Segment.end_time,
+            Segment.text,
+            Segment.anonymized_text,
+            Segment.speaker,
+        )
+        .where(Segment.job_id == job_id)
+        .order_by(Segment.segment_index)
+    )
+    query = select(Job.status).where(Job.id == job_id)
 
-    if not job:
+    # The status check and the segment fetch are independent, run them side by side
+    job_rows, segments_result = await asyncio.gather(
+        _fetch_all(session_maker, query), db.execute(segments_query)
+    )
+    job_status = job_rows[0].status if job_rows else None
+
+    if job_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Jobbet hittades inte",
         )
 
-    if job.status != DBJobStatus.COMPLETED:
+    if job_status != DBJobStatus.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Jobbet måste vara klart för förstärkt avidentifiering. Status: {job.status.value}",
+            detail=f"Jobbet måste vara klart för förstärkt avidentifiering. Status: {job_status.value}",
         )
 
-    # Convert segments to dict format for processing
-    sorted_segments = sorted(job.segments, key=lambda s: s.segment_index)
-    segments_data = [
-        {
-            "segment_index": s.segment_index,
-            "start_time": s.start_time,
-            "end_time": s.end_time,
-            "text": s.text,
-            "anonymized_text": s.anonymized_text,
-            "speaker": s.speaker,
-        }
-        for s in sorted_segments
-    ]
+    rows = segments_result.all()
+    if request.source_field == "anonymized_text":
+        # Segments without NER output fall back to the original text
+        texts = [row.anonymized_text or row.text for row in rows]
+    else:
+        texts = [row.text for row in rows]
 
     # Convert request patterns to tuples
     custom_patterns = (
@@ -305,70 +416,93 @@ async def enhance_anonymization(
         [(w.word, w.replacement) for w in request.custom_words] if request.custom_words else None
     )
 
-    # Apply enhanced anonymization
-    enhanced_segments = enhanced_anonymize_segments(
-        segments=segments_data,
+    # Apply enhanced anonymization (CPU-bound regex work, kept off the event loop)
+    enhanced_texts, changes_count = await asyncio.to_thread(
+        enhanced_anonymize_texts,
+        texts,
         use_institution_patterns=request.use_institution_patterns,
         use_format_patterns=request.use_format_patterns,
         custom_patterns=custom_patterns,
         custom_words=custom_words,
-        source_field=request.source_field,
-        target_field="enhanced_anonymized_text",
-    )
-
-    # Count changes
-    changes_count = sum(
-        1
-        for s in enhanced_segments
-        if s.get("enhanced_anonymized_text") != s.get(request.source_field, s.get("text"))
     )
+    enhanced_segments = [
+        {**row._mapping, "enhanced_anonymized_text": text}
+        for row, text in zip(rows, enhanced_texts)
+    ]
 
-    return EnhancedAnonymizationResponse(
-        job_id=job_id,
-        segments=[EnhancedSegmentResponse(**s) for s in enhanced_segments],
-        changes_count=changes_count,
-        patterns_applied={
+    return _json_response({
+        "job_id": job_id,
+        "segments": enhanced_segments,
+        "changes_count": changes_count,
+        "patterns_applied": {
             "institution_patterns": request.use_institution_patterns,
             "format_patterns": request.use_format_patterns,
             "custom_patterns": bool(custom_patterns),
             "custom_words": bool(custom_words),
         },
-    )
+    })
 
 
 @router.patch("/{job_id}/segments/{segment_id}", response_model=SegmentResponse)
 async def update_segment(
     job_id: str,
     segment_id: int,
-    update: SegmentUpdate,
+    segment_update: SegmentUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> Segment:
+) -> SegmentResponse:
     """
     Update a segment's text or speaker.
 
     Use this to correct transcription errors or assign speaker names.
     """
-    # Find the segment
-    query = select(Segment).where(Segment.id == segment_id, Segment.job_id == job_id)
-    result = await db.execute(query)
-    segment = result.scalar_one_or_none()
+    # Update fields if provided
+    values: dict = {}
+    if segment_update.text is not None:
+        values["text"] = segment_update.text
+    if segment_update.speaker is not None:
+        values["speaker"] = segment_update.speaker if segment_update.speaker else None
+
+    columns = _SEGMENT_RESPONSE_COLUMNS
+    where = (Segment.id == segment_id, Segment.job_id == job_id)
+
+    word_count_delta = 0
+    if "text" in values:
+        # Job.word_count is served as transcript metadata, keep it in step with
+        # the edit; counted with str.split() like the worker does
+        old_text = await db.scalar(select(Segment.text).where(*where))
+        if old_text is not None:
+            word_count_delta = len(values["text"].split()) - len(old_text.split())
+
+    if values:
+        # Write and read back the row in one statement
+        stmt = (
+            update(Segment)
+            .where(*where)
+            .values(**values)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*columns).where(*where)
+
+    row = (await db.execute(stmt)).one_or_none()
 
-    if not segment:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Segmentet hittades inte",
         )
 
-    # Update fields if provided
-    if update.text is not None:
-        segment.text = update.text
-    if update.speaker is not None:
-        segment.speaker = update.speaker if update.speaker else None
+    if word_count_delta:
+        await db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(word_count=func.coalesce(Job.word_count, 0) + word_count_delta)
+        )
 
     await db.commit()
-    await db.refresh(segment)
 
-    return segment
+    return from_row(SegmentResponse, row)
 
 
 @router.post("/{job_id}/rename-speaker", response_model=SpeakerRenameResponse)
@@ -382,41 +516,33 @@ async def rename_speaker(
 
     Useful for replacing generic names like "Talare 1" with actual names.
     """
-    # Verify job exists
-    job_query = select(Job).where(Job.id == job_id)
-    job_result = await db.execute(job_query)
-    job = job_result.scalar_one_or_none()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Jobbet hittades inte",
-        )
-
-    # Find all segments with the old speaker name
-    segments_query = select(Segment).where(
-        Segment.job_id == job_id, Segment.speaker == rename.old_name
+    # Rename in a single statement
+    result = await db.execute(
+        update(Segment)
+        .where(Segment.job_id == job_id, Segment.speaker == rename.old_name)
+        .values(speaker=rename.new_name)
     )
-    result = await db.execute(segments_query)
-    segments = result.scalars().all()
 
-    if not segments:
+    if result.rowcount == 0:
+        # Nothing matched: tell a missing job apart from a missing speaker
+        job_exists = await db.scalar(select(Job.id).where(Job.id == job_id))
+        if not job_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Jobbet hittades inte",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Inga segment hittades med talaren '{rename.old_name}'",
         )
 
-    # Update all segments
-    for segment in segments:
-        segment.speaker = rename.new_name
-
     await db.commit()
 
     return SpeakerRenameResponse(
         job_id=job_id,
         old_name=rename.old_name,
         new_name=rename.new_name,
-        segments_updated=len(segments),
+        segments_updated=result.rowcount,
     )
 
 
@@ -438,52 +564,68 @@ async def run_anonymization_on_job(
             detail="Avidentifieringstjänsten är inte tillgänglig. Transformers-biblioteket saknas.",
         )
 
-    # Get job with segments
-    query = select(Job).where(Job.id == job_id).options(selectinload(Job.segments))
-    result = await db.execute(query)
-    job = result.scalar_one_or_none()
+    query = select(Job.status).where(Job.id == job_id)
+    job_status = (await db.execute(query)).scalar_one_or_none()
 
-    if not job:
+    if job_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Jobbet hittades inte",
         )
 
-    if job.status != DBJobStatus.COMPLETED:
+    if job_status != DBJobStatus.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Jobbet måste vara klart för avidentifiering. Status: {job.status.value}",
+            detail=f"Jobbet måste vara klart för avidentifiering. Status: {job_status.value}",
         )
 
-    # Check if already has anonymization
-    has_existing = any(s.anonymized_text and s.anonymized_text != s.text for s in job.segments)
-
-    # Convert segments to dict format for processing
-    sorted_segments = sorted(job.segments, key=lambda s: s.segment_index)
-    segments_data = [
-        {
-            "text": s.text,
-            "segment_index": s.segment_index,
-        }
-        for s in sorted_segments
-    ]
+    # Check if already has anonymization (stops at the first differing segment)
+    has_existing = bool(
+        await db.scalar(
+            select(
+                exists().where(
+                    Segment.job_id == job_id,
+                    Segment.anonymized_text.is_not(None),
+                    Segment.anonymized_text != "",
+                    Segment.anonymized_text != Segment.text,
+                )
+            )
+        )
+    )
 
-    # Run NER anonymization
-    anonymized_segments = run_ner_anonymization(segments_data, progress_callback=None)
+    segments_query = (
+        select(Segment.id, Segment.text, Segment.anonymized_text)
+        .where(Segment.job_id == job_id)
+        .order_by(Segment.segment_index)
+    )
+    sorted_segments = (await db.execute(segments_query)).all()
+
+    # Run NER anonymization in a worker thread so other requests are not blocked
+    anonymized_texts = await asyncio.to_thread(
+        run_ner_anonymization, [s.text for s in sorted_segments], progress_callback=None
+    )
+    if anonymized_texts is None:
+        # NER unavailable: no changes, segments without anonymization get the original
+        anonymized_texts = [s.text for s in sorted_segments]
 
-    # Update segments in database
+    # Collect changed rows and write them in one executemany UPDATE
     changes_count = 0
-    for i, segment in enumerate(sorted_segments):
-        new_text = anonymized_segments[i].get("anonymized_text", segment.text)
+    updates: list[dict] = []
+    for segment, new_text in zip(sorted_segments, anonymized_texts):
         if new_text != segment.text:
-            segment.anonymized_text = new_text
+            updates.append({"id": segment.id, "anonymized_text": new_text})
             changes_count += 1
         elif not segment.anonymized_text:
             # Set to original if no changes
-            segment.anonymized_text = segment.text
+            updates.append({"id": segment.id, "anonymized_text": segment.text})
+
+    if updates:
+        await db.execute(update(Segment), updates)
 
     # Update job to indicate anonymization is enabled
-    job.enable_anonymization = True
+    await db.execute(
+        update(Job).where(Job.id == job_id).values(enable_anonymization=True)
+    )
 
     await db.commit()
 
@@ -512,43 +654,64 @@ async def search_transcripts(
             detail="Sökfrågan måste vara minst 2 tecken",
         )
 
-    search_term = f"%{q.strip()}%"
+    term = q.strip()
+    if is_segment_fts_enabled() and len(term) >= 3:
+        # Trigram index lookup; the term is quoted as a single FTS phrase
+        phrase = '"' + term.replace('"', '""') + '"'
+        match = Segment.id.in_(
+            select(literal_column("rowid"))
+            .select_from(table("segments_fts"))
+            .where(literal_column("segments_fts").op("MATCH")(phrase))
+        )
+    else:
+        # Trigrams need at least 3 characters
+        match = Segment.text.ilike(f"%{term}%")
 
-    # Find matching segments with their jobs
+    # Find matching segments with their jobs, reading only the returned columns
     query = (
-        select(Segment, Job)
+        select(
+            Segment.segment_index,
+            Segment.start_time,
+            Segment.end_time,
+            Segment.text,
+            Segment.speaker,
+            Job.id,
+            Job.file_name,
+            Job.created_at,
+        )
         .join(Job, Segment.job_id == Job.id)
-        .where(Segment.text.ilike(search_term))
+        .where(match)
         .where(Job.status == DBJobStatus.COMPLETED)
         .order_by(Job.created_at.desc(), Segment.segment_index)
         .limit(limit)
     )
 
     result = await db.execute(query)
-    rows = result.all()
+    rows = result.mappings().all()
 
     # Group results by job
     jobs_map: dict[str, SearchResultJob] = {}
-    for segment, job in rows:
-        if job.id not in jobs_map:
-            jobs_map[job.id] = SearchResultJob(
-                job_id=job.id,
-                file_name=job.file_name,
-                created_at=job.created_at.isoformat(),
+    for row in rows:
+        job_id = row["id"]
+        if job_id not in jobs_map:
+            jobs_map[job_id] = SearchResultJob(
+                job_id=job_id,
+                file_name=row["file_name"],
+                created_at=row["created_at"].isoformat(),
                 segments=[],
                 total_matches=0,
             )
 
-        jobs_map[job.id].segments.append(
+        jobs_map[job_id].segments.append(
             SearchResultSegment(
-                segment_index=segment.segment_index,
-                start_time=segment.start_time,
-                end_time=segment.end_time,
-                text=segment.text,
-                speaker=segment.speaker,
+                segment_index=row["segment_index"],
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+                text=row["text"],
+                speaker=row["speaker"],
             )
         )
-        jobs_map[job.id].total_matches += 1
+        jobs_map[job_id].total_matches += 1
 
     results = list(jobs_map.values())
     total_segments = sum(job.total_matches for job in results)
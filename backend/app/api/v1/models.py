@@ -1,14 +1,14 @@
 """Model management endpoints."""
 
-from fastapi import APIRouter
+import asyncio
+from importlib.util import find_spec
+
+import orjson
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    torch = None  # type: ignore
-    TORCH_AVAILABLE = False
+# torch is imported only when the system status is requested, not at startup
+TORCH_AVAILABLE = find_spec("torch") is not None
 
 router = APIRouter()
 
@@ -58,6 +58,9 @@ KB_WHISPER_MODELS: list[ModelInfo] = [
     ),
 ]
 
+# The model list never changes at runtime, so it is serialized once
+_MODELS_JSON = orjson.dumps([m.model_dump() for m in KB_WHISPER_MODELS])
+
 
 class SystemStatus(BaseModel):
     """System status information."""
@@ -68,21 +71,26 @@ class SystemStatus(BaseModel):
     recommended_compute_type: str
 
 
+# GPU availability does not change while the process runs; probed on first request
+_system_status: SystemStatus | None = None
+
+
 @router.get("", response_model=list[ModelInfo])
-async def list_models() -> list[ModelInfo]:
+async def list_models() -> Response:
     """List available KB-Whisper models."""
-    return KB_WHISPER_MODELS
+    return Response(_MODELS_JSON, media_type="application/json")
 
 
-@router.get("/system", response_model=SystemStatus)
-async def get_system_status() -> SystemStatus:
-    """Get system information including GPU availability."""
+def _probe_system_status() -> SystemStatus:
+    """Query torch for the GPU (blocking; imports torch on first use)."""
     if not TORCH_AVAILABLE:
         return SystemStatus(
             gpu_available=False,
             recommended_compute_type="int8",
         )
 
+    import torch
+
     gpu_available = torch.cuda.is_available()
 
     if gpu_available:
@@ -97,3 +105,12 @@ async def get_system_status() -> SystemStatus:
         gpu_available=False,
         recommended_compute_type="int8",
     )
+
+
+@router.get("/system", response_model=SystemStatus)
+async def get_system_status() -> SystemStatus:
+    """Get system information including GPU availability."""
+    global _system_status
+    if _system_status is None:
+        _system_status = await asyncio.to_thread(_probe_system_status)
+    return _system_status
@@ -1,5 +1,6 @@
 """Settings API – manage HuggingFace token and other runtime config."""
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -8,9 +9,16 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from app.config import settings
+from app.services.diarization import set_hf_token
 
 router = APIRouter()
 
+# Serializes read-modify-write of the .env file across concurrent requests
+_env_lock = asyncio.Lock()
+
+# Parsed .env lines keyed by the file's mtime, re-read only when the file changes
+_env_cache: tuple[int, list[str]] | None = None
+
 
 def _env_file_path() -> Path:
     """Return the .env file used by the running app."""
@@ -21,14 +29,24 @@ def _env_file_path() -> Path:
 
 
 def _read_env_lines(path: Path) -> list[str]:
-    if path.exists():
-        return path.read_text(encoding="utf-8").splitlines()
-    return []
+    """Return the lines of the .env file, served from cache while its mtime is unchanged."""
+    global _env_cache
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
 
+    if _env_cache is not None and _env_cache[0] == mtime_ns:
+        return list(_env_cache[1])
 
-def _write_env_key(key: str, value: str | None) -> None:
-    """Set or remove a key in the .env file and update the runtime config."""
-    env_path = _env_file_path()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    _env_cache = (mtime_ns, lines)
+    return list(lines)
+
+
+def _update_env_file(env_path: Path, key: str, value: str | None) -> None:
+    """Set or remove a key in the .env file (blocking)."""
+    global _env_cache
     env_path.parent.mkdir(parents=True, exist_ok=True)
 
     lines = _read_env_lines(env_path)
@@ -48,6 +66,14 @@ def _write_env_key(key: str, value: str | None) -> None:
         new_lines.append(f"{key}={value}")
 
     env_path.write_text("\n".join(new_lines) + "\n", encoding="utf-8")
+    _env_cache = (env_path.stat().st_mtime_ns, new_lines)
+
+
+async def _write_env_key(key: str, value: str | None) -> None:
+    """Set or remove a key in the .env file and update the runtime config."""
+    # File I/O runs in a worker thread to keep the event loop free
+    async with _env_lock:
+        await asyncio.to_thread(_update_env_file, _env_file_path(), key, value)
 
     # Update runtime
     if value is not None:
@@ -86,8 +112,8 @@ async def save_hf_token(body: HFTokenSave) -> HFTokenStatus:
     if not token:
         raise HTTPException(status_code=400, detail="Token kan inte vara tomt")
 
-    _write_env_key("HF_TOKEN", token)
-    settings.hf_token = token
+    await _write_env_key("HF_TOKEN", token)
+    set_hf_token(token)
 
     preview = token[:5] + "..." + token[-4:] if len(token) > 12 else "***"
     return HFTokenStatus(configured=True, token_preview=preview)
@@ -96,6 +122,6 @@ async def save_hf_token(body: HFTokenSave) -> HFTokenStatus:
 @router.delete("/hf-token")
 async def remove_hf_token() -> HFTokenStatus:
     """Remove the HF token from .env and runtime."""
-    _write_env_key("HF_TOKEN", None)
-    settings.hf_token = None
+    await _write_env_key("HF_TOKEN", None)
+    set_hf_token(None)
     return HFTokenStatus(configured=False)
@@ -1,12 +1,12 @@
 """Word template management endpoints."""
 
-import json
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.pagination import CachedCount, decode_cursor, encode_cursor
 from app.db.database import get_db
 from app.models.template import WordTemplate
 from app.schemas.segment import (
@@ -19,15 +19,16 @@ from app.schemas.segment import (
 
 router = APIRouter()
 
+_template_count = CachedCount(WordTemplate.id)
+
 
 def template_to_response(template: WordTemplate) -> WordTemplateResponse:
-    """Convert a WordTemplate model to a response schema."""
-    words = json.loads(template.words_json)
-    return WordTemplateResponse(
+    """Convert a WordTemplate model to a response schema (stored data, not validated)."""
+    return WordTemplateResponse.model_construct(
         id=template.id,
         name=template.name,
         description=template.description,
-        words=[CustomWordItem(**w) for w in words],
+        words=[CustomWordItem.model_construct(**w) for w in template.words],
         created_at=template.created_at.isoformat(),
         updated_at=template.updated_at.isoformat(),
     )
@@ -36,28 +37,46 @@ def template_to_response(template: WordTemplate) -> WordTemplateResponse:
 @router.get("", response_model=WordTemplateListResponse)
 async def list_templates(
     db: Annotated[AsyncSession, Depends(get_db)],
-    skip: int = 0,
-    limit: int = 50,
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: str | None = None,
 ) -> WordTemplateListResponse:
-    """List all word templates."""
-    # Get total count
-    count_query = select(func.count(WordTemplate.id))
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    """
+    List all word templates, sorted by name.
 
-    # Get templates
+    Pass next_cursor from the previous page as cursor to continue; skip is
+    only used when no cursor is given.
+    """
+    # Get templates, one extra to know whether there is a next page
     query = (
         select(WordTemplate)
-        .order_by(WordTemplate.name.asc())
-        .offset(skip)
-        .limit(limit)
+        .order_by(WordTemplate.name.asc(), WordTemplate.id.asc())
+        .limit(limit + 1)
     )
+    if cursor:
+        name, template_id = decode_cursor(cursor, 2)
+        query = query.where(tuple_(WordTemplate.name, WordTemplate.id) > tuple_(name, template_id))
+    else:
+        query = query.offset(skip)
     result = await db.execute(query)
-    templates = result.scalars().all()
+    templates = list(result.scalars().all())
+
+    next_cursor = None
+    if len(templates) > limit:
+        templates = templates[:limit]
+        next_cursor = encode_cursor(templates[-1].name, templates[-1].id)
+
+    # A short first page already holds every template, no need to count
+    if not cursor and skip == 0 and next_cursor is None:
+        total, total_is_exact = len(templates), True
+    else:
+        total, total_is_exact = await _template_count.get(db)
 
     return WordTemplateListResponse(
         templates=[template_to_response(t) for t in templates],
         total=total,
+        total_is_exact=total_is_exact,
+        next_cursor=next_cursor,
     )
 
 
@@ -77,16 +96,15 @@ async def create_template(
         )
 
     # Create template
-    words_json = json.dumps([w.model_dump() for w in data.words])
     template = WordTemplate(
         name=data.name,
         description=data.description,
-        words_json=words_json,
+        words=[w.model_dump() for w in data.words],
     )
 
     db.add(template)
     await db.commit()
-    await db.refresh(template)
+    _template_count.adjust(db, 1)
 
     return template_to_response(template)
 
@@ -142,10 +160,9 @@ async def update_template(
         template.description = data.description
 
     if data.words is not None:
-        template.words_json = json.dumps([w.model_dump() for w in data.words])
+        template.words = [w.model_dump() for w in data.words]
 
     await db.commit()
-    await db.refresh(template)
 
     return template_to_response(template)
 
@@ -168,5 +185,6 @@ async def delete_template(
 
     await db.delete(template)
     await db.commit()
+    _template_count.adjust(db, -1)
 
     return {"status": "deleted", "template_id": template_id}
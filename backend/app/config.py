@@ -34,15 +34,21 @@ class Settings(BaseSettings):
     default_model: str = "KBLab/kb-whisper-small"
     default_compute_type: str = "float16"  # float16 for GPU, int8 for CPU
     default_device: str = "auto"  # auto, cpu, cuda
+    model_cache_size: int = 1  # Loaded Whisper models kept in memory (LRU)
 
     # Diarization
     enable_diarization: bool = True
     hf_token: str | None = None  # HuggingFace token for pyannote
+    preload_diarization: bool = False  # Load the pipeline when a worker process starts
 
     # Processing
     max_file_size_mb: int = 2000  # 2GB max
     chunk_length_seconds: int = 30
 
+    # Concurrency (max_concurrent_jobs * ct2_intra_threads should be <= os.cpu_count())
+    max_concurrent_jobs: int = 0  # 0 = auto: 1 on GPU, cpu_count // ct2_intra_threads on CPU
+    ct2_intra_threads: int = 4  # CTranslate2 threads per transcription
+
     # Frontend static files (built with 'npm run build' in frontend/)
     static_dir: Path = Path(__file__).parent.parent.parent / "frontend" / "out"
 
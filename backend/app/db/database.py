@@ -1,16 +1,69 @@
 """Database configuration and session management."""
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import logging
+from typing import NamedTuple
+
+import orjson
+from sqlalchemy import event, make_url, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.config import settings
 from app.models.base import Base
 
+logger = logging.getLogger(__name__)
+
+
+def _engine_options(database_url: str) -> dict:
+    """Pool settings for the configured database."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single static connection without a pool
+        return {}
+
+    options = {"pool_size": 10, "max_overflow": 20}
+    if url.get_backend_name() != "sqlite":
+        # Server connections can drop while idle; a local file cannot
+        options["pool_pre_ping"] = True
+    return options
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
+    # JSON columns are encoded and decoded by orjson instead of the json module
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+    **_engine_options(settings.database_url),
+)
+
+# Applied once per physical SQLite connection; pooled connections keep them
+_SQLITE_PRAGMAS = (
+    # Readers no longer block on the job worker's writes
+    "PRAGMA journal_mode=WAL",
+    # Safe with WAL; only the last transactions can be lost on power failure
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
 )
 
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -18,19 +71,184 @@ async_session_maker = async_sessionmaker(
 )
 
 
+# Set by init_db when the SQLite full-text index for segment search is in place
+_segment_fts_enabled = False
+
+
+def is_segment_fts_enabled() -> bool:
+    """Whether global search can use the segments_fts index."""
+    return _segment_fts_enabled
+
+
+async def setup_segment_fts(conn: AsyncConnection) -> bool:
+    """
+    Create the FTS5 index used by global search, kept in sync by triggers.
+
+    The trigram tokenizer matches arbitrary substrings, like the previous
+    ILIKE '%q%' search. Returns False if SQLite lacks FTS5 or trigram support.
+    """
+    if conn.dialect.name != "sqlite":
+        return False
+
+    result = await conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'segments_fts'")
+    )
+    exists = result.first() is not None
+
+    try:
+        await conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5("
+            "text, content='segments', content_rowid='id', tokenize='trigram')"
+        ))
+    except OperationalError as e:
+        logger.warning(f"Full-text search unavailable, falling back to LIKE: {e}")
+        return False
+
+    await conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS segments_fts_ai AFTER INSERT ON segments BEGIN "
+        "INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text); END"
+    ))
+    await conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS segments_fts_ad AFTER DELETE ON segments BEGIN "
+        "INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text); "
+        "END"
+    ))
+    await conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS segments_fts_au AFTER UPDATE OF text ON segments BEGIN "
+        "INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text); "
+        "INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text); END"
+    ))
+
+    if not exists:
+        # Index segments that were stored before the table existed
+        await conn.execute(text("INSERT INTO segments_fts(segments_fts) VALUES ('rebuild')"))
+
+    return True
+
+
+class _Statement(NamedTuple):
+    """
+    A migration statement, optionally guarded by a column check.
+
+    With table and column set, the statement only runs when the column exists
+    (column_exists=True) or is missing (False). Tables created by create_all
+    already have the newer columns and lack the ones later steps drop.
+    """
+
+    sql: str
+    table: str | None = None
+    column: str | None = None
+    column_exists: bool = True
+
+
+def _add_column(table: str, column: str, definition: str) -> _Statement:
+    """ALTER TABLE ADD COLUMN, skipped if the column is already there."""
+    return _Statement(f"ALTER TABLE {table} ADD COLUMN {column} {definition}", table, column, False)
+
+
+def _drop_column(table: str, column: str) -> _Statement:
+    """ALTER TABLE DROP COLUMN, skipped if the column is already gone."""
+    return _Statement(f"ALTER TABLE {table} DROP COLUMN {column}", table, column)
+
+
+# Schema migrations, applied in order to databases whose PRAGMA user_version is
+# lower than the step's version. Add new steps at the end.
+_MIGRATIONS: list[tuple[int, tuple[_Statement, ...]]] = [
+    (1, (_add_column("jobs", "name", "VARCHAR(255)"),)),
+    # Existing jobs had word timestamps enabled
+    (2, (_add_column("jobs", "enable_word_timestamps", "BOOLEAN NOT NULL DEFAULT 1"),)),
+    # Composite indexes on jobs, segments and words (created by _create_missing_indexes)
+    (3, ()),
+    # Word times as integer milliseconds and confidence as integer percent
+    (
+        4,
+        (
+            _add_column("words", "start_time_ms", "INTEGER NOT NULL DEFAULT 0"),
+            _add_column("words", "end_time_ms", "INTEGER NOT NULL DEFAULT 0"),
+            _add_column("words", "confidence_pct", "SMALLINT"),
+            _Statement(
+                "UPDATE words SET start_time_ms = CAST(round(start_time * 1000) AS INTEGER), "
+                "end_time_ms = CAST(round(end_time * 1000) AS INTEGER), "
+                "confidence_pct = CAST(round(confidence * 100) AS INTEGER)",
+                "words",
+                "start_time",
+            ),
+            # DROP COLUMN needs SQLite 3.35+
+            _drop_column("words", "start_time"),
+            _drop_column("words", "end_time"),
+            _drop_column("words", "confidence"),
+        ),
+    ),
+    # ner_entity_types from a comma-separated string to a JSON object of flags
+    (
+        5,
+        (
+            _Statement(
+                "UPDATE jobs SET ner_entity_types = json_object("
+                + ", ".join(
+                    f"'{name}', json(CASE WHEN instr(',' || ner_entity_types || ',', ',{name},') "
+                    "THEN 'true' ELSE 'false' END)"
+                    for name in ("persons", "locations", "organizations", "dates", "events")
+                )
+                + ") WHERE ner_entity_types IS NOT NULL AND NOT json_valid(ner_entity_types)"
+            ),
+        ),
+    ),
+]
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    """Create model indexes that were added after the tables were created."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+async def migrate_schema(conn: AsyncConnection) -> None:
+    """Bring an existing database up to SCHEMA_VERSION; a no-op on warm starts."""
+    version = (await conn.execute(text("PRAGMA user_version"))).scalar() or 0
+    if version >= SCHEMA_VERSION:
+        return
+
+    logger.info(f"Migrating database schema from version {version} to {SCHEMA_VERSION}")
+    for step_version, statements in _MIGRATIONS:
+        if step_version <= version:
+            continue
+        for statement in statements:
+            if statement.table is not None:
+                result = await conn.execute(text(f"PRAGMA table_info({statement.table})"))
+                columns = {row[1] for row in result}
+                if (statement.column in columns) != statement.column_exists:
+                    continue
+            await conn.execute(text(statement.sql))
+
+    # create_all skips indexes on tables that already exist
+    await conn.run_sync(_create_missing_indexes)
+    await conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await migrate_schema(conn)
 
-        # Migration: add 'name' column to jobs table if it doesn't exist
-        result = await conn.execute(text("PRAGMA table_info(jobs)"))
-        columns = [row[1] for row in result.fetchall()]
-        if "name" not in columns:
-            await conn.execute(text("ALTER TABLE jobs ADD COLUMN name VARCHAR(255)"))
+        global _segment_fts_enabled
+        _segment_fts_enabled = await setup_segment_fts(conn)
 
 
 async def get_db() -> AsyncSession:
     """Dependency for getting database session."""
     async with async_session_maker() as session:
         yield session
+
+
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    """
+    Dependency for opening extra short-lived sessions.
+
+    An AsyncSession runs one statement at a time, so independent queries that
+    should run concurrently with the request session need a session of their own.
+    """
+    return async_session_maker
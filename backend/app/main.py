@@ -20,24 +20,6 @@ if sys.platform == "win32":
                 shutil.copy2(src_resolved, dst)
     os.symlink = _symlink_or_copy
 
-# Patch torch.load BEFORE any other imports that might use torch
-# This fixes PyTorch 2.6+ compatibility with pyannote models
-def _patch_torch_load():
-    try:
-        import torch
-        if hasattr(torch, '_original_load'):
-            return
-        torch._original_load = torch.load
-        def patched_load(*args, **kwargs):
-            if 'weights_only' not in kwargs:
-                kwargs['weights_only'] = False
-            return torch._original_load(*args, **kwargs)
-        torch.load = patched_load
-    except ImportError:
-        pass
-
-_patch_torch_load()
-
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import AsyncGenerator
@@ -50,6 +32,7 @@ from fastapi.staticfiles import StaticFiles
 from app.api.v1.router import api_router
 from app.config import settings
 from app.db.database import init_db
+from app.workers.transcription_worker import shutdown_workers, start_worker_warm_up
 
 
 @asynccontextmanager
@@ -57,9 +40,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events."""
     # Startup
     await init_db()
+    start_worker_warm_up()
     yield
     # Shutdown
-    pass
+    shutdown_workers()
 
 
 app = FastAPI(
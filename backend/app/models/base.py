@@ -1,8 +1,21 @@
 """SQLAlchemy base model."""
 
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import DeclarativeBase
 
 
+def utcnow() -> datetime:
+    """
+    Current UTC time as a naive datetime.
+
+    Replaces the deprecated datetime.utcnow(). Columns are plain DateTime
+    (no timezone), so the value is stored naive to stay compatible with
+    existing rows.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
 
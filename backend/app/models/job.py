@@ -5,10 +5,10 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Enum, Integer, String, Text, Boolean, Float
+from sqlalchemy import JSON, DateTime, Enum, Index, Integer, String, Text, Boolean, Float
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base
+from app.models.base import Base, utcnow
 
 if TYPE_CHECKING:
     from app.models.segment import Segment
@@ -28,6 +28,11 @@ class Job(Base):
     """Transcription job database model."""
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Newest-first job list (keyset on created_at, id) and search over completed jobs
+        Index("idx_job_created", "created_at", "id"),
+        Index("idx_job_status_created", "status", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
 
@@ -44,9 +49,13 @@ class Job(Base):
     model: Mapped[str] = mapped_column(String(100), default="KBLab/kb-whisper-small")
     enable_diarization: Mapped[bool] = mapped_column(Boolean, default=True)
     enable_anonymization: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Word-level timestamps are only needed by the audio editor and roughly double decode time
+    enable_word_timestamps: Mapped[bool] = mapped_column(Boolean, default=True)
     language: Mapped[str] = mapped_column(String(10), default="sv")
-    # NER entity types to anonymize (stored as comma-separated string: "persons,locations,organizations,dates,events")
-    ner_entity_types: Mapped[str | None] = mapped_column(String(200), nullable=True, default=None)
+    # NER entity types to anonymize, the NerEntityTypesConfig flags as a JSON object
+    ner_entity_types: Mapped[dict[str, bool] | None] = mapped_column(
+        JSON(none_as_null=True), nullable=True, default=None
+    )
 
     # Status
     status: Mapped[JobStatus] = mapped_column(
@@ -57,7 +66,7 @@ class Job(Base):
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
     started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
@@ -68,5 +77,8 @@ class Job(Base):
 
     # Relationships
     segments: Mapped[list["Segment"]] = relationship(
-        "Segment", back_populates="job", cascade="all, delete-orphan"
+        "Segment",
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="Segment.segment_index",
     )
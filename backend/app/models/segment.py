@@ -2,7 +2,7 @@
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -16,6 +16,11 @@ class Segment(Base):
     """Transcription segment database model."""
 
     __tablename__ = "segments"
+    __table_args__ = (
+        # Transcript/export reads, and per-speaker updates within a job
+        Index("idx_seg_job_idx", "job_id", "segment_index"),
+        Index("idx_seg_job_speaker", "job_id", "speaker"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     job_id: Mapped[str] = mapped_column(
@@ -34,5 +39,8 @@ class Segment(Base):
     # Relationships
     job: Mapped["Job"] = relationship("Job", back_populates="segments")
     words: Mapped[list["Word"]] = relationship(
-        "Word", back_populates="segment", cascade="all, delete-orphan"
+        "Word",
+        back_populates="segment",
+        cascade="all, delete-orphan",
+        order_by="Word.word_index",
     )
@@ -3,10 +3,10 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import JSON, DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base
+from app.models.base import Base, utcnow
 
 
 class WordTemplate(Base):
@@ -18,11 +18,11 @@ class WordTemplate(Base):
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
-    # Words stored as JSON string: [{"word": "...", "replacement": "..."}]
-    words_json: Mapped[str] = mapped_column(Text, nullable=False, default="[]")
+    # Words as [{"word": "...", "replacement": "..."}], stored as JSON text in words_json
+    words: Mapped[list[dict]] = mapped_column("words_json", JSON, nullable=False, default=list)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utcnow, onupdate=utcnow
     )
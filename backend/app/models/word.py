@@ -2,7 +2,8 @@
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, SmallInteger, String
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -15,6 +16,10 @@ class Word(Base):
     """Word-level transcription with precise timestamps."""
 
     __tablename__ = "words"
+    __table_args__ = (
+        # Eager loading a segment's words in order
+        Index("idx_word_segment_idx", "segment_id", "word_index"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     segment_id: Mapped[int] = mapped_column(
@@ -23,13 +28,57 @@ class Word(Base):
 
     # Word data
     word_index: Mapped[int] = mapped_column(Integer, nullable=False)
-    start_time: Mapped[float] = mapped_column(Float, nullable=False)
-    end_time: Mapped[float] = mapped_column(Float, nullable=False)
+    # Stored as integers (milliseconds, percent): SQLite writes small integers
+    # in 1-4 bytes where every REAL takes 8. Use the float properties below.
+    start_time_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    end_time_ms: Mapped[int] = mapped_column(Integer, nullable=False)
     text: Mapped[str] = mapped_column(String(200), nullable=False)
-    confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
+    confidence_pct: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
 
     # Editing state - whether this word is included in edited output
     included: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     # Relationships
     segment: Mapped["Segment"] = relationship("Segment", back_populates="words")
+
+    @hybrid_property
+    def start_time(self) -> float:
+        """Start time in seconds."""
+        return self.start_time_ms / 1000
+
+    @start_time.inplace.setter
+    def _start_time_setter(self, value: float) -> None:
+        self.start_time_ms = round(value * 1000)
+
+    @start_time.inplace.expression
+    @classmethod
+    def _start_time_expression(cls):
+        return (cls.start_time_ms / 1000.0).label("start_time")
+
+    @hybrid_property
+    def end_time(self) -> float:
+        """End time in seconds."""
+        return self.end_time_ms / 1000
+
+    @end_time.inplace.setter
+    def _end_time_setter(self, value: float) -> None:
+        self.end_time_ms = round(value * 1000)
+
+    @end_time.inplace.expression
+    @classmethod
+    def _end_time_expression(cls):
+        return (cls.end_time_ms / 1000.0).label("end_time")
+
+    @hybrid_property
+    def confidence(self) -> float | None:
+        """Word probability between 0 and 1, in steps of 0.01."""
+        return None if self.confidence_pct is None else self.confidence_pct / 100
+
+    @confidence.inplace.setter
+    def _confidence_setter(self, value: float | None) -> None:
+        self.confidence_pct = None if value is None else round(value * 100)
+
+    @confidence.inplace.expression
+    @classmethod
+    def _confidence_expression(cls):
+        return (cls.confidence_pct / 100.0).label("confidence")
@@ -0,0 +1,32 @@
+"""Build response schemas from trusted database rows without validation."""
+
+from collections.abc import Callable
+from operator import attrgetter
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Per schema: field names and a getter reading all of them from a row in one call
+_row_readers: dict[type[BaseModel], tuple[tuple[str, ...], Callable[[Any], tuple]]] = {}
+
+
+def from_row(cls: type[ModelT], row: Any) -> ModelT:
+    """
+    Build a response schema from an ORM object or Row by attribute name.
+
+    Uses model_construct, so values are not validated: only pass data read
+    from the database. Request bodies must still go through validation.
+    """
+    reader = _row_readers.get(cls)
+    if reader is None:
+        names = tuple(cls.model_fields)
+        getter = attrgetter(*names)
+        if len(names) == 1:
+            single = getter
+            getter = lambda obj: (single(obj),)  # noqa: E731
+        reader = _row_readers[cls] = (names, getter)
+
+    names, getter = reader
+    return cls.model_construct(**dict(zip(names, getter(row))))
@@ -1,19 +1,12 @@
 """Job-related Pydantic schemas."""
 
 from datetime import datetime
-from enum import Enum
+from itertools import product
 
 from pydantic import BaseModel, ConfigDict
 
-
-class JobStatus(str, Enum):
-    """Job status enumeration."""
-
-    PENDING = "pending"
-    PROCESSING = "processing"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    CANCELLED = "cancelled"
+# Shared with the ORM model so rows can be turned into responses without conversion
+from app.models.job import JobStatus
 
 
 class NerEntityTypesConfig(BaseModel):
@@ -25,6 +18,19 @@ class NerEntityTypesConfig(BaseModel):
     dates: bool = True  # Time expressions/dates
     events: bool = True  # Events
 
+    def enabled_types(self) -> tuple[str, ...]:
+        """Names of the enabled entity types, in field order."""
+        return _ENABLED_NER_TYPES[
+            (self.persons, self.locations, self.organizations, self.dates, self.events)
+        ]
+
+
+# Every combination of the five flags resolved once at import
+_ENABLED_NER_TYPES: dict[tuple[bool, ...], tuple[str, ...]] = {
+    flags: tuple(name for name, enabled in zip(NerEntityTypesConfig.model_fields, flags) if enabled)
+    for flags in product((False, True), repeat=len(NerEntityTypesConfig.model_fields))
+}
+
 
 class JobCreate(BaseModel):
     """Schema for creating a new transcription job."""
@@ -34,6 +40,7 @@ class JobCreate(BaseModel):
     model: str = "KBLab/kb-whisper-small"
     enable_diarization: bool = True
     enable_anonymization: bool = False
+    enable_word_timestamps: bool = True
     language: str = "sv"
     ner_entity_types: NerEntityTypesConfig | None = None
 
@@ -51,6 +58,7 @@ class JobResponse(BaseModel):
     model: str
     enable_diarization: bool
     enable_anonymization: bool
+    enable_word_timestamps: bool = True
     language: str
     status: JobStatus
     progress: int
@@ -75,3 +83,7 @@ class JobListResponse(BaseModel):
 
     jobs: list[JobResponse]
     total: int
+    # False when total comes from the in-memory count and may be stale
+    total_is_exact: bool = True
+    # Cursor for the next page, None on the last page
+    next_cursor: str | None = None
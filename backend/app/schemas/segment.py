@@ -152,6 +152,10 @@ class WordTemplateListResponse(BaseModel):
 
     templates: list[WordTemplateResponse]
     total: int
+    # False when total comes from the in-memory count and may be stale
+    total_is_exact: bool = True
+    # Cursor for the next page, None on the last page
+    next_cursor: str | None = None
 
 
 # =============================================================================
@@ -184,43 +184,39 @@ def pattern_anonymize_text(
     return result
 
 
-def enhanced_anonymize_segments(
-    segments: list[dict],
+def enhanced_anonymize_texts(
+    texts: list[str],
     use_institution_patterns: bool = True,
     use_format_patterns: bool = True,
     custom_patterns: list[tuple[str, str]] | None = None,
     custom_words: list[tuple[str, str]] | None = None,
-    source_field: str = "text",
-    target_field: str = "enhanced_anonymized_text",
-) -> list[dict]:
+) -> tuple[list[str], int]:
     """
-    Apply pattern-based anonymization to transcription segments.
+    Apply pattern-based anonymization to a list of segment texts.
 
     This is a SEPARATE step intended to run after initial transcription,
     either on original text or on already NER-anonymized text.
 
     Args:
-        segments: List of segment dicts
+        texts: Segment texts, in segment order
         use_institution_patterns: Apply Swedish institution patterns
         use_format_patterns: Apply format patterns (personnummer, etc.)
         custom_patterns: Additional regex patterns
         custom_words: Exact word replacements
-        source_field: Field to read text from ("text" or "anonymized_text")
-        target_field: Field to write result to
 
     Returns:
-        Segments with target_field populated
+        Tuple of (anonymized texts in the same order, number of texts changed)
     """
-    logger.info(f"Enhanced anonymization: processing {len(segments)} segments")
+    logger.info(f"Enhanced anonymization: processing {len(texts)} segments")
     logger.info(f"  Institution patterns: {use_institution_patterns}")
     logger.info(f"  Format patterns: {use_format_patterns}")
     logger.info(f"  Custom patterns: {len(custom_patterns) if custom_patterns else 0}")
     logger.info(f"  Custom words: {len(custom_words) if custom_words else 0}")
 
+    results: list[str] = []
     changes_made = 0
 
-    for segment in segments:
-        source_text = segment.get(source_field, segment.get("text", ""))
+    for source_text in texts:
         anonymized = pattern_anonymize_text(
             source_text,
             use_institution_patterns=use_institution_patterns,
@@ -228,15 +224,15 @@ def enhanced_anonymize_segments(
             custom_patterns=custom_patterns,
             custom_words=custom_words,
         )
-        segment[target_field] = anonymized
+        results.append(anonymized)
 
         if anonymized != source_text:
             changes_made += 1
 
     logger.info(
-        f"Enhanced anonymization complete: {changes_made}/{len(segments)} segments modified"
+        f"Enhanced anonymization complete: {changes_made}/{len(texts)} segments modified"
     )
-    return segments
+    return results, changes_made
 
 
 # Entity type mappings (KB-BERT NER labels)
@@ -372,30 +368,30 @@ def anonymize_text(
     return anonymized
 
 
-def anonymize_segments(
-    segments: list[dict],
+def anonymize_texts(
+    texts: list[str],
     progress_callback: Callable[[int, str], None] | None = None,
     entity_types: set[str] | None = None,
-) -> list[dict]:
+) -> list[str] | None:
     """
-    Anonymize sensitive information in transcription segments.
+    Anonymize sensitive information in a list of segment texts.
 
     Args:
-        segments: List of segment dicts with 'text' field
+        texts: Segment texts, in segment order
         progress_callback: Optional callback for progress updates
         entity_types: Set of entity type categories to anonymize.
                      Options: "persons", "locations", "organizations", "dates", "events"
                      If None, all types are anonymized.
 
     Returns:
-        Segments with 'anonymized_text' field added
+        Anonymized texts in the same order, or None if NER is unavailable
     """
     if not is_anonymization_available():
         logger.warning("Anonymization not available - transformers not installed, skipping")
         # Update progress to skip anonymization range (90% -> 95%)
         if progress_callback:
             progress_callback(95, "anonymization_skipped")
-        return segments
+        return None
 
     if progress_callback:
         progress_callback(90, "loading_anonymization_model")
@@ -404,7 +400,7 @@ def anonymize_segments(
         ner_pipeline = get_ner_pipeline()
     except Exception as e:
         logger.error(f"Could not load NER model: {e}")
-        return segments
+        return None
 
     if progress_callback:
         progress_callback(92, "anonymizing")
@@ -412,12 +408,10 @@ def anonymize_segments(
     # Track person names across all segments for consistent numbering
     person_counter: dict[str, int] = {}
 
-    total = len(segments)
-    for i, segment in enumerate(segments):
-        original_text = segment.get("text", "")
-        segment["anonymized_text"] = anonymize_text(
-            original_text, ner_pipeline, person_counter, entity_types
-        )
+    results: list[str] = []
+    total = len(texts)
+    for i, original_text in enumerate(texts):
+        results.append(anonymize_text(original_text, ner_pipeline, person_counter, entity_types))
 
         # Update progress (92-95% range)
         if progress_callback and total > 0:
@@ -428,4 +422,30 @@ def anonymize_segments(
         progress_callback(95, "anonymization_complete")
 
     logger.info(f"Anonymized {total} segments, found {len(person_counter)} unique persons")
+    return results
+
+
+def anonymize_segments(
+    segments: list[dict],
+    progress_callback: Callable[[int, str], None] | None = None,
+    entity_types: set[str] | None = None,
+) -> list[dict]:
+    """
+    Anonymize sensitive information in transcription segments.
+
+    Args:
+        segments: List of segment dicts with 'text' field
+        progress_callback: Optional callback for progress updates
+        entity_types: Set of entity type categories to anonymize (see anonymize_texts)
+
+    Returns:
+        Segments with 'anonymized_text' field added, or unchanged if NER is unavailable
+    """
+    texts = anonymize_texts(
+        [segment.get("text", "") for segment in segments], progress_callback, entity_types
+    )
+    if texts is None:
+        return segments
+    for segment, anonymized in zip(segments, texts):
+        segment["anonymized_text"] = anonymized
     return segments
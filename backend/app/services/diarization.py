@@ -2,8 +2,9 @@
 
 import logging
 import os
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 # Add ffmpeg to PATH if installed via winget (Windows)
 _ffmpeg_paths = [
@@ -17,69 +18,203 @@ for _ffmpeg_path in _ffmpeg_paths:
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
-# Flag to track if diarization is available
-_diarization_available: bool | None = None
+
+def _module_installed(name: str) -> bool:
+    """Check whether a module can be found, without importing it."""
+    try:
+        return find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+# whisperx and pyannote are probed at import without being imported: they pull
+# in torch, which would slow down API startup
+DIARIZATION_DEPS_INSTALLED = _module_installed("whisperx") and _module_installed("pyannote.audio")
 
 # Cache for diarization model
 _diarization_model = None
 
+# The missing-token warning is logged once per process, not on every check
+_hf_token_warned = False
+
+# whisperx and its diarization pipeline, imported once by _ensure_imports()
+_whisperx = None
+_DiarizationPipeline = None
 
-def _patch_torch_for_pyannote():
-    """Patch torch.load for PyTorch 2.6+ compatibility with pyannote models."""
+
+def patch_torch_load() -> None:
+    """
+    Patch torch.load for PyTorch 2.6+ compatibility with pyannote models.
+
+    The single torch.load patch for the app; safe to call repeatedly.
+    """
     try:
         import torch
-        if not hasattr(torch, '_patched_for_pyannote'):
-            original_load = torch.load
+        import torch.serialization
+    except ImportError:
+        return
 
-            def safe_load(*args, **kwargs):
-                kwargs['weights_only'] = False
-                return original_load(*args, **kwargs)
+    if hasattr(torch, "_patched_for_pyannote"):
+        return
 
-            torch.load = safe_load
-            torch._patched_for_pyannote = True
-            logger.info("Patched torch.load for pyannote compatibility")
-    except ImportError:
+    # Add safe globals for pyannote compatibility
+    try:
+        torch.serialization.add_safe_globals([torch.torch_version.TorchVersion])
+    except Exception:
         pass
 
+    original_load = torch.load
 
-def is_diarization_available() -> bool:
-    """Check if diarization dependencies are installed and configured."""
-    global _diarization_available
+    def safe_load(*args, **kwargs):
+        kwargs["weights_only"] = False
+        return original_load(*args, **kwargs)
 
-    if _diarization_available is not None:
-        return _diarization_available
+    torch.load = safe_load
+    torch._patched_for_pyannote = True
+    logger.info("Patched torch.load for pyannote compatibility")
 
-    # Patch torch BEFORE importing pyannote
-    _patch_torch_for_pyannote()
 
-    try:
+def _ensure_imports() -> None:
+    """Import whisperx once and keep the modules in globals for later calls."""
+    global _whisperx, _DiarizationPipeline
+
+    if _whisperx is None:
+        # Patch torch BEFORE importing pyannote
+        patch_torch_load()
+
         import whisperx
-        from pyannote.audio import Pipeline
+        from whisperx.diarize import DiarizationPipeline
+
+        _whisperx, _DiarizationPipeline = whisperx, DiarizationPipeline
+
+
+def is_diarization_available() -> bool:
+    """Check if diarization dependencies are installed and configured."""
+    global _hf_token_warned
 
-        # Check if HuggingFace token is configured
-        if not settings.hf_token:
+    if not DIARIZATION_DEPS_INSTALLED:
+        return False
+
+    # Check if HuggingFace token is configured
+    if not settings.hf_token:
+        if not _hf_token_warned:
             logger.warning(
                 "HuggingFace token not configured. "
                 "Speaker diarization requires accepting pyannote terms and setting HF_TOKEN."
             )
-            _diarization_available = False
-            return False
+            _hf_token_warned = True
+        return False
 
-        _diarization_available = True
-        return True
+    return True
 
-    except ImportError as e:
-        logger.warning(f"Diarization dependencies not installed: {e}")
-        _diarization_available = False
-        return False
+
+def clear_diarization_cache() -> None:
+    """Drop the loaded model, e.g. after the HF token changed."""
+    global _diarization_model
+
+    _diarization_model = None
+
+
+def set_hf_token(token: str | None) -> None:
+    """
+    Use a new HF token in this process, dropping a model loaded with another one.
+
+    Worker processes keep the settings they were spawned with, so each job
+    passes the API process's current token here.
+    """
+    if token != settings.hf_token:
+        settings.hf_token = token
+        clear_diarization_cache()
+
+
+def _load_diarization_model() -> None:
+    """Load the diarization pipeline into the module cache."""
+    global _diarization_model
+
+    _ensure_imports()
+    logger.info("Loading diarization model (first time, may take a while)...")
+
+    import torch
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    _diarization_model = _DiarizationPipeline(
+        use_auth_token=settings.hf_token,
+        device=device,
+    )
+    logger.info("Diarization model loaded successfully")
+
+
+def preload_diarization() -> None:
+    """Load the diarization model ahead of the first job; failures are only logged."""
+    if _diarization_model is not None or not is_diarization_available():
+        return
+    try:
+        _load_diarization_model()
+    except Exception as e:
+        logger.warning("Diarization preload failed: %s", e)
+
+
+# Segments per block when computing overlaps, bounds the (segments x turns) matrix
+_OVERLAP_BLOCK_SIZE = 256
+
+
+def _assign_segment_speakers(diarize_segments, segments: list[dict]) -> "np.ndarray":
+    """
+    Pick the speaker with the largest total overlap for each segment.
+
+    Same rule as whisperx.assign_word_speakers at segment level, but computed on
+    arrays instead of one DataFrame filter per segment.
+
+    Args:
+        diarize_segments: Diarization DataFrame with start, end and speaker columns
+        segments: Transcription segments with start and end
+
+    Returns:
+        Speaker label per segment, "" where no speaker turn overlaps
+    """
+    import numpy as np
+
+    n = len(segments)
+    labels = np.full(n, "", dtype=object)
+    if diarize_segments is None or len(diarize_segments) == 0 or n == 0:
+        return labels
+
+    starts = np.fromiter((s["start"] for s in segments), dtype=np.float64, count=n)
+    ends = np.fromiter((s["end"] for s in segments), dtype=np.float64, count=n)
+    turn_starts = diarize_segments["start"].to_numpy(dtype=np.float64)
+    turn_ends = diarize_segments["end"].to_numpy(dtype=np.float64)
+    speakers, turn_speaker = np.unique(
+        diarize_segments["speaker"].to_numpy(dtype=object), return_inverse=True
+    )
+
+    # Turn -> speaker indicator, so a matrix product sums overlap per speaker
+    indicator = np.zeros((len(turn_starts), len(speakers)))
+    indicator[np.arange(len(turn_starts)), turn_speaker] = 1.0
+
+    for lo in range(0, n, _OVERLAP_BLOCK_SIZE):
+        hi = min(lo + _OVERLAP_BLOCK_SIZE, n)
+        overlap = np.minimum(turn_ends, ends[lo:hi, None]) - np.maximum(
+            turn_starts, starts[lo:hi, None]
+        )
+        np.maximum(overlap, 0.0, out=overlap)
+        per_speaker = overlap @ indicator
+        best = per_speaker.argmax(axis=1)
+        found = per_speaker[np.arange(hi - lo), best] > 0
+        labels[lo:hi][found] = speakers[best[found]]
+
+    return labels
 
 
 def add_speaker_labels(
     segments: list[dict],
     audio_path: Path | str,
     progress_callback: Callable[[int, str], None] | None = None,
+    audio: "np.ndarray | None" = None,
 ) -> list[dict]:
     """
     Add speaker labels to transcription segments using WhisperX and pyannote.
@@ -88,6 +223,7 @@ def add_speaker_labels(
         segments: List of transcription segments with start, end, text
         audio_path: Path to the original audio file
         progress_callback: Optional callback for progress updates
+        audio: Already decoded 16 kHz mono waveform; skips decoding audio_path
 
     Returns:
         Updated segments with speaker labels
@@ -97,37 +233,26 @@ def add_speaker_labels(
         return segments
 
     try:
-        # Ensure torch is patched before any pyannote imports
-        _patch_torch_for_pyannote()
-
-        import torch
-        import whisperx
-        from whisperx.diarize import DiarizationPipeline
-
-        global _diarization_model
+        _ensure_imports()
 
         audio_path = Path(audio_path)
-        device = "cuda" if torch.cuda.is_available() else "cpu"
 
         # Load or use cached diarization model
         if _diarization_model is None:
             if progress_callback:
                 progress_callback(71, "loading_diarization_model")
-            logger.info("Loading diarization model (first time, may take a while)...")
-
-            _diarization_model = DiarizationPipeline(
-                use_auth_token=settings.hf_token,
-                device=device,
-            )
-            logger.info("Diarization model loaded successfully")
+            _load_diarization_model()
         else:
             logger.info("Using cached diarization model")
 
         if progress_callback:
             progress_callback(75, "loading_audio_for_diarization")
 
-        # Load audio
-        audio = whisperx.load_audio(str(audio_path))
+        # Load audio unless the transcription step already decoded it
+        if audio is None:
+            from app.services.transcription import load_audio
+
+            audio = load_audio(audio_path)
 
         if progress_callback:
             progress_callback(78, "diarizing")
@@ -135,52 +260,45 @@ def add_speaker_labels(
         # Run diarization
         logger.info("Running diarization...")
         diarize_segments = _diarization_model(audio)
-        logger.info(f"Diarization returned {len(diarize_segments) if diarize_segments is not None else 0} speaker segments")
+        logger.info(
+            "Diarization returned %d speaker segments",
+            len(diarize_segments) if diarize_segments is not None else 0,
+        )
 
         if progress_callback:
             progress_callback(85, "assigning_speakers")
 
-        # Convert our segments to whisperx format
-        whisperx_segments = {
-            "segments": [
-                {
-                    "start": s["start"],
-                    "end": s["end"],
-                    "text": s["text"],
-                }
-                for s in segments
-            ]
-        }
-
         # Assign speakers
-        logger.info(f"Assigning speakers to {len(segments)} transcription segments...")
-        result = whisperx.assign_word_speakers(diarize_segments, whisperx_segments)
-
-        # Log what we got back
-        result_segments = result.get("segments", [])
-        logger.info(f"assign_word_speakers returned {len(result_segments)} segments")
+        logger.info("Assigning speakers to %d transcription segments...", len(segments))
+        labels = _assign_segment_speakers(diarize_segments, segments)
 
-        # Update original segments with speaker info
+        # Update original segments with speaker info. Each distinct label is
+        # converted once (SPEAKER_00 -> "Talare 1", etc.) and then looked up.
+        speaker_map: dict[str, str] = {}
         speakers_assigned = 0
-        unique_speakers = set()
-        for i, segment in enumerate(result_segments):
-            if i < len(segments):
-                speaker = segment.get("speaker")
-                if speaker:
-                    unique_speakers.add(speaker)
-                    # Convert SPEAKER_00 to "Talare 1", etc.
-                    speaker_num = int(speaker.split("_")[1]) + 1
-                    segments[i]["speaker"] = f"Talare {speaker_num}"
-                    speakers_assigned += 1
+        for i, speaker in enumerate(labels.tolist()):
+            if not speaker:
+                continue
+            label = speaker_map.get(speaker)
+            if label is None:
+                label = f"Talare {int(speaker.split('_')[1]) + 1}"
+                speaker_map[speaker] = label
+            segments[i]["speaker"] = label
+            speakers_assigned += 1
 
         if progress_callback:
             progress_callback(90, "diarization_complete")
 
-        logger.info(f"Diarization complete: {speakers_assigned}/{len(segments)} segments got speakers, {len(unique_speakers)} unique speakers found")
+        logger.info(
+            "Diarization complete: %d/%d segments got speakers, %d unique speakers found",
+            speakers_assigned,
+            len(segments),
+            len(speaker_map),
+        )
         return segments
 
     except Exception as e:
-        logger.error(f"Diarization failed: {e}")
+        logger.error("Diarization failed: %s", e)
         if progress_callback:
             progress_callback(90, "diarization_failed")
         # Return segments without speaker labels
@@ -1,22 +1,51 @@
 """KB-Whisper transcription service using faster-whisper."""
 
+import gc
 import logging
+import os
+import time
+from collections import OrderedDict
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Callable, Iterator
+from typing import TYPE_CHECKING, Callable, Iterator
 
-try:
+from app.config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
     from faster_whisper import WhisperModel
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WhisperModel = None  # type: ignore
-    WHISPER_AVAILABLE = False
 
-from app.config import settings
+# faster-whisper (and CTranslate2) is imported on first use so that importing
+# this module does not slow down API startup
+WHISPER_AVAILABLE = find_spec("faster_whisper") is not None
 
 logger = logging.getLogger(__name__)
 
-# Cache for loaded models
-_model_cache: dict[str, WhisperModel] = {}
+# faster-whisper models expect 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Minimum time between transcription progress callbacks (seconds)
+PROGRESS_INTERVAL = 0.25
+
+# LRU cache for loaded models (bounded by settings.model_cache_size)
+_model_cache: "OrderedDict[str, WhisperModel]" = OrderedDict()
+
+
+def load_audio(audio_path: Path | str) -> "np.ndarray":
+    """
+    Decode an audio file to a 16 kHz mono float32 waveform.
+
+    Decodes in-process with PyAV instead of starting an ffmpeg subprocess.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        The decoded waveform
+    """
+    from faster_whisper.audio import decode_audio
+
+    return decode_audio(str(audio_path), sampling_rate=SAMPLE_RATE)
 
 
 class TranscriptionResult:
@@ -27,10 +56,41 @@ class TranscriptionResult:
         segments: list[dict],
         language: str,
         duration: float,
+        audio: "np.ndarray | None" = None,
+        word_count: int = 0,
     ):
         self.segments = segments
         self.language = language
         self.duration = duration
+        self.word_count = word_count
+        # Decoded 16 kHz mono float32 waveform, reusable by diarization
+        self.audio = audio
+
+
+def resolve_device(device: str) -> str:
+    """Resolve "auto" to the device the models will actually run on."""
+    if device != "auto":
+        return device
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+def get_max_concurrent_jobs() -> int:
+    """
+    Number of transcriptions that may run at the same time.
+
+    A single CTranslate2 model is already multi-threaded, so on CPU we only run
+    as many jobs as there are ct2_intra_threads-sized slices of the machine.
+    On GPU jobs are serialized to avoid context thrashing.
+    """
+    if settings.max_concurrent_jobs > 0:
+        return settings.max_concurrent_jobs
+    if resolve_device(settings.default_device) == "cuda":
+        return 1
+    return max(1, (os.cpu_count() or 1) // max(1, settings.ct2_intra_threads))
 
 
 def get_model(model_id: str, device: str = "auto", compute_type: str = "auto") -> "WhisperModel":
@@ -48,21 +108,19 @@ def get_model(model_id: str, device: str = "auto", compute_type: str = "auto") -
     if not WHISPER_AVAILABLE:
         raise RuntimeError("faster-whisper is not installed. Install it with: pip install faster-whisper")
 
+    from faster_whisper import WhisperModel
+
     cache_key = f"{model_id}_{device}_{compute_type}"
 
     if cache_key in _model_cache:
         logger.info(f"Using cached model: {model_id}")
+        _model_cache.move_to_end(cache_key)
         return _model_cache[cache_key]
 
     logger.info(f"Loading model: {model_id} (device={device}, compute_type={compute_type})")
 
     # Determine device and compute type
-    if device == "auto":
-        try:
-            import torch
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-        except ImportError:
-            device = "cpu"
+    device = resolve_device(device)
 
     if compute_type == "auto":
         compute_type = "float16" if device == "cuda" else "int8"
@@ -72,9 +130,16 @@ def get_model(model_id: str, device: str = "auto", compute_type: str = "auto") -
         device=device,
         compute_type=compute_type,
         download_root=str(settings.models_dir),
+        cpu_threads=settings.ct2_intra_threads,
+        num_workers=1,
     )
 
     _model_cache[cache_key] = model
+    while len(_model_cache) > max(1, settings.model_cache_size):
+        evicted_key, evicted = _model_cache.popitem(last=False)
+        logger.info(f"Evicting cached model: {evicted_key}")
+        del evicted
+        _release_memory()
     logger.info(f"Model loaded successfully: {model_id}")
 
     return model
@@ -85,6 +150,7 @@ def transcribe_audio(
     model_id: str = "KBLab/kb-whisper-small",
     language: str = "sv",
     progress_callback: Callable[[int, str], None] | None = None,
+    word_timestamps: bool = True,
 ) -> TranscriptionResult:
     """
     Transcribe an audio file using KB-Whisper.
@@ -94,6 +160,7 @@ def transcribe_audio(
         model_id: HuggingFace model ID
         language: Language code (default: "sv" for Swedish)
         progress_callback: Optional callback for progress updates (progress_percent, step_name)
+        word_timestamps: Extract word-level timestamps (needed by the audio editor)
 
     Returns:
         TranscriptionResult with segments, language, and duration
@@ -115,9 +182,12 @@ def transcribe_audio(
         progress_callback(15, "transcribing")
 
     logger.info(f"Starting transcription of {audio_path}")
+    # Decode once to 16 kHz mono PCM so later steps can reuse the same buffer
+    audio = load_audio(audio_path)
+
     # Transcribe with faster-whisper
     segments_iter, info = model.transcribe(
-        str(audio_path),
+        audio,
         language=language,
         task="transcribe",
         beam_size=5,
@@ -126,18 +196,20 @@ def transcribe_audio(
             min_silence_duration_ms=500,
         ),
         condition_on_previous_text=False,  # Better for long audio
-        word_timestamps=True,  # Enable word-level timestamps for audio editing
+        word_timestamps=word_timestamps,  # Word-level timestamps for audio editing
     )
 
     # Collect segments with progress tracking
     segments = []
     total_duration = info.duration
     last_progress = 15
+    next_tick = 0.0
+    word_count = 0
 
     for segment in segments_iter:
         # Extract word-level data if available
         words = []
-        if hasattr(segment, "words") and segment.words:
+        if word_timestamps and segment.words:
             for word in segment.words:
                 words.append({
                     "start": word.start,
@@ -146,21 +218,27 @@ def transcribe_audio(
                     "confidence": getattr(word, "probability", None),
                 })
 
+        text = segment.text.strip()
+        word_count += len(text.split())
+
         segment_dict = {
             "start": segment.start,
             "end": segment.end,
-            "text": segment.text.strip(),
+            "text": text,
             "confidence": getattr(segment, "avg_logprob", None),
             "words": words,
         }
         segments.append(segment_dict)
 
-        # Update progress based on position in audio
+        # Update progress based on position in audio, at most once per PROGRESS_INTERVAL
         if progress_callback and total_duration > 0:
-            current_progress = 15 + int((segment.end / total_duration) * 55)  # 15-70% range
-            if current_progress > last_progress:
-                progress_callback(current_progress, "transcribing")
-                last_progress = current_progress
+            now = time.monotonic()
+            if now >= next_tick:
+                current_progress = 15 + int((segment.end / total_duration) * 55)  # 15-70% range
+                if current_progress > last_progress:
+                    progress_callback(current_progress, "transcribing")
+                    last_progress = current_progress
+                    next_tick = now + PROGRESS_INTERVAL
 
     if progress_callback:
         progress_callback(70, "transcription_complete")
@@ -170,13 +248,25 @@ def transcribe_audio(
         segments=segments,
         language=info.language,
         duration=total_duration,
+        audio=audio,
+        word_count=word_count,
     )
 
 
+def _release_memory() -> None:
+    """Collect freed models and return cached GPU memory to the driver."""
+    gc.collect()
+    try:
+        import torch
+        torch.cuda.empty_cache()
+    except Exception:
+        pass
+
+
 def clear_model_cache() -> None:
     """Clear the model cache to free memory."""
-    global _model_cache
     _model_cache.clear()
+    _release_memory()
     logger.info("Model cache cleared")
 
 
@@ -4,52 +4,193 @@
 import os
 os.environ["TORCH_FORCE_WEIGHTS_ONLY_LOAD"] = "0"
 
-# Also patch torch.load as backup
-def _ensure_torch_patched():
-    try:
-        import torch
-        import torch.serialization
-        # Add safe globals for pyannote compatibility
-        try:
-            torch.serialization.add_safe_globals([torch.torch_version.TorchVersion])
-        except Exception:
-            pass
-        # Patch torch.load to use weights_only=False by default
-        if not hasattr(torch, '_original_load'):
-            torch._original_load = torch.load
-            def patched_load(*args, **kwargs):
-                if 'weights_only' not in kwargs:
-                    kwargs['weights_only'] = False
-                return torch._original_load(*args, **kwargs)
-            torch.load = patched_load
-    except ImportError:
-        pass
-
-_ensure_torch_patched()
-
 import asyncio
 import logging
+import multiprocessing
 import queue
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
 from functools import partial
 from pathlib import Path
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.db.database import async_session_maker
+from app.models.base import utcnow
 from app.models.job import Job, JobStatus
 from app.models.segment import Segment
 from app.models.word import Word
-from app.services.transcription import transcribe_audio
-from app.services.diarization import add_speaker_labels, is_diarization_available
+from app.schemas.job import NerEntityTypesConfig
+from app.services.transcription import get_max_concurrent_jobs, transcribe_audio
+from app.services.diarization import (
+    add_speaker_labels,
+    is_diarization_available,
+    patch_torch_load,
+    preload_diarization,
+    set_hf_token,
+)
 from app.services.anonymization import anonymize_segments, is_anonymization_available
 
 logger = logging.getLogger(__name__)
 
-# Thread pool for CPU-bound transcription work
-_executor = ThreadPoolExecutor(max_workers=2)
+# Transcription runs in spawned worker processes, at most
+# get_max_concurrent_jobs() at a time. A worker runs one job at a time and keeps
+# its loaded models for the next one. A job that times out is stopped by
+# terminating its own worker; jobs in other workers keep running.
+_mp_context = multiprocessing.get_context("spawn")
+_workers: set["_WorkerProcess"] = set()
+_idle_workers: list["_WorkerProcess"] = []
+_job_slots: asyncio.Semaphore | None = None
+_manager = None
+
+# Idle workers kept for the next job; each holds its own copy of the models
+_MAX_IDLE_WORKERS = 1
+
+JOB_TIMEOUT = 1800.0  # 30 minutes
+
+
+class WorkerProcessError(RuntimeError):
+    """The worker process exited before returning a result."""
+
+
+def _init_worker_process() -> None:
+    """Initialize a transcription worker process."""
+    # Applies the Windows symlink fallback in the child
+    import app.main  # noqa: F401
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Diarization runs in this process, so this is where its model has to be warm
+    if settings.preload_diarization and settings.enable_diarization:
+        preload_diarization()
+
+
+def _worker_main(conn) -> None:
+    """Worker process loop: run each call received on the pipe and send back the result."""
+    _init_worker_process()
+    while True:
+        try:
+            func = conn.recv()
+        except EOFError:
+            return  # The API process closed the pipe
+        try:
+            reply = (True, func())
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception:
+            # The exception itself could not be pickled
+            conn.send((False, RuntimeError(f"{type(reply[1]).__name__}: {reply[1]}")))
+
+
+class _WorkerProcess:
+    """A transcription worker process and the pipe that hands it calls."""
+
+    def __init__(self) -> None:
+        self.conn, child_conn = _mp_context.Pipe()
+        self.process = _mp_context.Process(target=_worker_main, args=(child_conn,))
+        self.process.start()
+        child_conn.close()
+        _workers.add(self)
+
+    def call(self, func):
+        """Run func() in the worker and return its result (blocking)."""
+        try:
+            self.conn.send(func)
+            ok, value = self.conn.recv()
+        except (EOFError, OSError) as e:
+            raise WorkerProcessError("Transcription process exited unexpectedly") from e
+        if not ok:
+            raise value
+        return value
+
+    def stop(self) -> None:
+        """Let an idle worker exit by closing its pipe."""
+        _workers.discard(self)
+        self.conn.close()
+
+    def terminate(self) -> None:
+        """Kill the worker, also in the middle of a job."""
+        _workers.discard(self)
+        self.process.terminate()
+
+
+def _release_worker(worker: _WorkerProcess) -> None:
+    """Keep a worker that finished a job for the next one, or let it exit."""
+    if len(_idle_workers) < _MAX_IDLE_WORKERS:
+        _idle_workers.append(worker)
+    else:
+        worker.stop()
+
+
+async def run_in_worker(func, timeout: float | None = None):
+    """
+    Run func() in a worker process and return its result.
+
+    Waits for a free job slot first. On timeout or cancellation only the
+    worker running func is terminated.
+    """
+    global _job_slots
+    if _job_slots is None:
+        max_jobs = get_max_concurrent_jobs()
+        logger.info(f"Running up to {max_jobs} transcription job(s) at a time")
+        _job_slots = asyncio.Semaphore(max_jobs)
+
+    async with _job_slots:
+        worker = None
+        while _idle_workers:
+            worker = _idle_workers.pop()
+            if worker.process.is_alive():
+                break
+            worker.terminate()
+            worker = None
+        if worker is None:
+            worker = _WorkerProcess()
+
+        try:
+            result = await asyncio.wait_for(asyncio.to_thread(worker.call, func), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError, WorkerProcessError):
+            # A stuck ffmpeg/CT2 call cannot be interrupted; the blocked
+            # call() thread returns once the process is gone
+            worker.terminate()
+            raise
+        except Exception:
+            _release_worker(worker)
+            raise
+        _release_worker(worker)
+        return result
+
+
+def _warm_up_worker() -> None:
+    """Start an idle worker so it loads its models before the first job."""
+    if len(_idle_workers) < _MAX_IDLE_WORKERS:
+        _idle_workers.append(_WorkerProcess())
+
+
+def start_worker_warm_up() -> None:
+    """Start a worker process in the background so it preloads its models before the first job."""
+    if settings.preload_diarization and settings.enable_diarization:
+        _warm_up_worker()
+
+
+def _get_progress_queue() -> queue.Queue:
+    """Create a progress queue that can be shared with worker processes."""
+    global _manager
+    if _manager is None:
+        _manager = _mp_context.Manager()
+    return _manager.Queue()
+
+
+def shutdown_workers() -> None:
+    """Stop worker processes and the progress queue manager."""
+    global _manager
+    for worker in list(_workers):
+        worker.terminate()
+    _idle_workers.clear()
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
 
 
 async def update_job_progress(
@@ -78,7 +219,7 @@ async def mark_job_started(job_id: str) -> None:
 
         if job:
             job.status = JobStatus.PROCESSING
-            job.started_at = datetime.utcnow()
+            job.started_at = utcnow()
             job.current_step = "starting"
             await db.commit()
 
@@ -98,7 +239,7 @@ async def mark_job_completed(
 
         if job:
             job.status = JobStatus.COMPLETED
-            job.completed_at = datetime.utcnow()
+            job.completed_at = utcnow()
             job.progress = 100
             job.current_step = "completed"
             job.duration_seconds = duration_seconds
@@ -117,7 +258,7 @@ async def mark_job_failed(job_id: str, error_message: str) -> None:
 
         if job:
             job.status = JobStatus.FAILED
-            job.completed_at = datetime.utcnow()
+            job.completed_at = utcnow()
             job.error_message = error_message
             job.current_step = "failed"
             await db.commit()
@@ -157,11 +298,12 @@ async def save_segments(job_id: str, segments: list[dict]) -> None:
         await db.commit()
 
 
-def parse_ner_entity_types(ner_entity_types_str: str | None) -> set[str] | None:
-    """Parse NER entity types from comma-separated string."""
-    if not ner_entity_types_str:
+def parse_ner_entity_types(ner_entity_types: dict[str, bool] | None) -> set[str] | None:
+    """Return the enabled NER entity types, or None (all types) when none are set."""
+    if not ner_entity_types:
         return None
-    return set(ner_entity_types_str.split(","))
+    config = NerEntityTypesConfig.model_construct(**ner_entity_types)
+    return set(config.enabled_types()) or None
 
 
 def run_transcription_sync(
@@ -170,11 +312,16 @@ def run_transcription_sync(
     language: str,
     enable_diarization: bool,
     enable_anonymization: bool,
-    ner_entity_types_str: str | None,
+    ner_entity_types: dict[str, bool] | None,
     progress_queue: queue.Queue,
+    enable_word_timestamps: bool = True,
+    hf_token: str | None = None,
 ) -> dict:
     """
-    Run transcription synchronously (for thread pool).
+    Run transcription synchronously (in a worker process).
+
+    hf_token is the API process's current token, which may have been changed
+    in the settings since this worker was spawned.
 
     Returns dict with segments, duration, and metadata.
     """
@@ -185,6 +332,9 @@ def run_transcription_sync(
         except Exception:
             pass  # Ignore if queue is full
 
+    patch_torch_load()
+    set_hf_token(hf_token)
+
     try:
         # Transcribe
         logger.info(f"Starting transcription with model: {model_id}")
@@ -193,10 +343,17 @@ def run_transcription_sync(
             model_id=model_id,
             language=language,
             progress_callback=progress_callback,
+            word_timestamps=enable_word_timestamps,
         )
 
         logger.info(f"Transcription returned {len(result.segments)} segments")
         segments = result.segments
+        word_count = result.word_count
+
+        # The decoded waveform is shared with diarization; take ownership here
+        # so it can be freed before anonymization loads its own model
+        audio = result.audio
+        result.audio = None
         logger.info(f"Transcription completed: {len(segments)} segments")
 
         # Add speaker labels if enabled
@@ -206,16 +363,18 @@ def run_transcription_sync(
                 segments=segments,
                 audio_path=audio_path,
                 progress_callback=progress_callback,
+                audio=audio,
             )
             logger.info("Speaker diarization completed")
         elif enable_diarization:
             logger.warning("Diarization was enabled but is not available (missing HF token or dependencies)")
             progress_callback(90, "diarization_unavailable")
+        del audio
 
         # Anonymize sensitive information if enabled
         if enable_anonymization and is_anonymization_available():
             logger.info("Starting anonymization...")
-            entity_types = parse_ner_entity_types(ner_entity_types_str)
+            entity_types = parse_ner_entity_types(ner_entity_types)
             segments = anonymize_segments(
                 segments=segments,
                 progress_callback=progress_callback,
@@ -229,8 +388,6 @@ def run_transcription_sync(
         # Calculate metadata
         logger.info("Calculating metadata...")
         speakers = set(s.get("speaker") for s in segments if s.get("speaker"))
-        word_count = sum(len(s["text"].split()) for s in segments)
-
         logger.info(f"Metadata done: {len(speakers)} speakers, {word_count} words")
         return {
             "segments": segments,
@@ -266,13 +423,14 @@ async def process_transcription_job(job_id: str) -> None:
         language = job.language
         enable_diarization = job.enable_diarization
         enable_anonymization = job.enable_anonymization
-        ner_entity_types_str = job.ner_entity_types
+        ner_entity_types = job.ner_entity_types
+        enable_word_timestamps = job.enable_word_timestamps
 
     # Mark as started
     await mark_job_started(job_id)
 
-    # Create thread-safe progress queue for communication with sync code
-    progress_queue: queue.Queue = queue.Queue()
+    # Create process-safe progress queue for communication with the worker
+    progress_queue = _get_progress_queue()
 
     # Start progress monitoring task
     async def monitor_progress() -> None:
@@ -292,26 +450,24 @@ async def process_transcription_job(job_id: str) -> None:
     monitor_task = asyncio.create_task(monitor_progress())
 
     try:
-        # Run transcription in thread pool with timeout (30 minutes max)
-        loop = asyncio.get_event_loop()
-        logger.info(f"Starting transcription thread for job {job_id}")
-        transcription_result = await asyncio.wait_for(
-            loop.run_in_executor(
-                _executor,
-                partial(
-                    run_transcription_sync,
-                    audio_path,
-                    model_id,
-                    language,
-                    enable_diarization,
-                    enable_anonymization,
-                    ner_entity_types_str,
-                    progress_queue,
-                ),
+        # Run transcription in a worker process with timeout (30 minutes max)
+        logger.info(f"Starting transcription process for job {job_id}")
+        transcription_result = await run_in_worker(
+            partial(
+                run_transcription_sync,
+                audio_path,
+                model_id,
+                language,
+                enable_diarization,
+                enable_anonymization,
+                ner_entity_types,
+                progress_queue,
+                enable_word_timestamps,
+                settings.hf_token,
             ),
-            timeout=1800.0,  # 30 minutes
+            timeout=JOB_TIMEOUT,
         )
-        logger.info(f"Transcription thread completed for job {job_id}")
+        logger.info(f"Transcription process completed for job {job_id}")
 
         # Stop progress monitor
         monitor_task.cancel()
@@ -12,7 +12,9 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 
 from app.main import app
 from app.models.base import Base
-from app.db.database import get_db
+from app.models.job import Job, JobStatus
+from app.models.segment import Segment
+from app.db.database import get_db, get_session_maker
 
 
 # Test database URL (in-memory SQLite)
@@ -56,6 +58,9 @@ async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield test_db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_maker] = lambda: async_sessionmaker(
+        test_db.bind, expire_on_commit=False
+    )
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -64,3 +69,39 @@ async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+async def completed_job(test_db: AsyncSession) -> Job:
+    """Create a completed job with a few transcript segments."""
+    job = Job(
+        file_name="intervju.mp3",
+        file_path="/nonexistent/intervju.mp3",
+        file_size=1024,
+        duration_seconds=3725.5,
+        status=JobStatus.COMPLETED,
+        speaker_count=2,
+        word_count=5,
+    )
+    job.segments = [
+        Segment(
+            segment_index=0,
+            start_time=0.0,
+            end_time=2.5,
+            text="Hej och välkommen.",
+            anonymized_text="Hej och välkommen.",
+            speaker="Talare 1",
+            confidence=-0.2,
+        ),
+        Segment(
+            segment_index=1,
+            start_time=3725.25,
+            end_time=3725.5,
+            text="Tack Anna.",
+            anonymized_text="Tack [PERSON].",
+            speaker="Talare 2",
+        ),
+    ]
+    test_db.add(job)
+    await test_db.commit()
+    return job
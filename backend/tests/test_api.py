@@ -2,6 +2,12 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import database
+from app.db.database import setup_segment_fts
+from app.models.job import Job
+from app.models.word import Word
 
 
 @pytest.mark.asyncio
@@ -32,6 +38,7 @@ async def test_list_jobs_empty(client: AsyncClient) -> None:
     data = response.json()
     assert data["jobs"] == []
     assert data["total"] == 0
+    assert data["total_is_exact"] is True
 
 
 @pytest.mark.asyncio
@@ -39,3 +46,266 @@ async def test_get_nonexistent_job(client: AsyncClient) -> None:
     """Test getting a job that doesn't exist."""
     response = await client.get("/api/v1/jobs/nonexistent-id")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_rename_speaker(client: AsyncClient, completed_job: Job) -> None:
+    """Test renaming a speaker across a job's segments."""
+    url = f"/api/v1/jobs/{completed_job.id}/rename-speaker"
+    response = await client.post(url, json={"old_name": "Talare 1", "new_name": "Anna"})
+    assert response.status_code == 200
+    assert response.json()["segments_updated"] == 1
+
+    response = await client.get(f"/api/v1/jobs/{completed_job.id}/transcript")
+    speakers = [s["speaker"] for s in response.json()["segments"]]
+    assert speakers == ["Anna", "Talare 2"]
+
+    # The old name no longer exists
+    response = await client.post(url, json={"old_name": "Talare 1", "new_name": "Bo"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_rename_speaker_unknown_job(client: AsyncClient) -> None:
+    """Test renaming a speaker in a job that doesn't exist."""
+    response = await client.post(
+        "/api/v1/jobs/nonexistent-id/rename-speaker",
+        json={"old_name": "Talare 1", "new_name": "Anna"},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Jobbet hittades inte"
+
+
+@pytest.mark.asyncio
+async def test_update_segment(client: AsyncClient, completed_job: Job) -> None:
+    """Test correcting a segment's text and clearing its speaker."""
+    segment_id = completed_job.segments[1].id
+    url = f"/api/v1/jobs/{completed_job.id}/segments/{segment_id}"
+
+    response = await client.patch(url, json={"text": "Tack så mycket.", "speaker": ""})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == segment_id
+    assert data["text"] == "Tack så mycket."
+    assert data["speaker"] is None
+    assert data["start_time"] == 3725.25
+
+    response = await client.patch(url, json={"speaker": "Bo"})
+    assert response.json()["speaker"] == "Bo"
+    assert response.json()["text"] == "Tack så mycket."
+
+    response = await client.patch(
+        f"/api/v1/jobs/{completed_job.id}/segments/999999", json={"text": "x"}
+    )
+    assert response.status_code == 404
+
+    # The transcript word count follows the edit (3 + 3 words)
+    response = await client.get(f"/api/v1/jobs/{completed_job.id}/transcript")
+    assert response.json()["metadata"]["word_count"] == 6
+
+
+@pytest.mark.asyncio
+async def test_global_search(client: AsyncClient, completed_job: Job) -> None:
+    """Test searching segment text across transcripts."""
+    response = await client.get("/api/v1/jobs/search/global", params={"q": "välkommen"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_jobs"] == 1
+    assert [s["segment_index"] for s in data["results"][0]["segments"]] == [0]
+
+
+@pytest.mark.asyncio
+async def test_global_search_fts(
+    client: AsyncClient,
+    completed_job: Job,
+    test_db: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test search through the FTS5 index, including edits made after indexing."""
+    async with test_db.bind.begin() as conn:
+        if not await setup_segment_fts(conn):
+            pytest.skip("SQLite built without FTS5 trigram support")
+    monkeypatch.setattr(database, "_segment_fts_enabled", True)
+
+    url = "/api/v1/jobs/search/global"
+    response = await client.get(url, params={"q": "VÄLKOM"})
+    assert response.json()["total_segments"] == 1
+
+    segment_id = completed_job.segments[1].id
+    await client.patch(
+        f"/api/v1/jobs/{completed_job.id}/segments/{segment_id}", json={"text": "Välkommen åter."}
+    )
+    response = await client.get(url, params={"q": "välkommen"})
+    assert response.json()["total_segments"] == 2
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_cursor_pagination(client: AsyncClient, test_db: AsyncSession) -> None:
+    """Test walking the job list with next_cursor."""
+    test_db.add_all(
+        [Job(file_name=f"fil{i}.mp3", file_path=f"/x/fil{i}.mp3", file_size=1) for i in range(5)]
+    )
+    await test_db.commit()
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = (await client.get("/api/v1/jobs", params=params)).json()
+        assert data["total"] == 5
+        seen += [job["id"] for job in data["jobs"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+
+    response = await client.get("/api/v1/jobs", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    # Page size is bounded, a negative limit would otherwise mean no LIMIT in SQLite
+    for limit in (0, -2, 1000):
+        response = await client.get("/api/v1/jobs", params={"limit": limit})
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_and_update_template(client: AsyncClient) -> None:
+    """Test that created and updated templates are returned in full."""
+    response = await client.post(
+        "/api/v1/templates",
+        json={"name": "Namn", "words": [{"word": "Anna", "replacement": "[PERSON]"}]},
+    )
+    assert response.status_code == 201
+    template = response.json()
+    assert template["id"] and template["created_at"] and template["updated_at"]
+
+    response = await client.patch(
+        f"/api/v1/templates/{template['id']}", json={"description": "Vanliga namn"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["description"] == "Vanliga namn"
+    assert data["words"] == [{"word": "Anna", "replacement": "[PERSON]"}]
+
+
+@pytest.mark.asyncio
+async def test_get_transcript(client: AsyncClient, completed_job: Job) -> None:
+    """Test fetching a transcript with its metadata."""
+    response = await client.get(f"/api/v1/jobs/{completed_job.id}/transcript")
+    assert response.status_code == 200
+    data = response.json()
+    assert [s["segment_index"] for s in data["segments"]] == [0, 1]
+    assert data["segments"][1]["anonymized_text"] == "Tack [PERSON]."
+    assert data["metadata"]["speaker_count"] == 2
+    assert data["metadata"]["word_count"] == 5
+    assert data["metadata"]["segment_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_enhance_anonymization(client: AsyncClient, completed_job: Job) -> None:
+    """Test applying custom word replacements to a transcript."""
+    response = await client.post(
+        f"/api/v1/jobs/{completed_job.id}/enhance-anonymization",
+        json={"custom_words": [{"word": "Anna", "replacement": "[NAMN]"}]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["changes_count"] == 1
+    assert data["segments"][1]["enhanced_anonymized_text"] == "Tack [NAMN]."
+    assert data["patterns_applied"]["custom_words"] is True
+
+
+@pytest.mark.asyncio
+async def test_run_anonymization_on_job(
+    client: AsyncClient, completed_job: Job, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that NER results are written back to the job's segments."""
+    from app.api.v1 import jobs
+
+    def fake_ner(texts, progress_callback=None):
+        return [text.replace("Hej", "[X]") for text in texts]
+
+    monkeypatch.setattr(jobs, "is_anonymization_available", lambda: True)
+    monkeypatch.setattr(jobs, "run_ner_anonymization", fake_ner)
+
+    response = await client.post(f"/api/v1/jobs/{completed_job.id}/run-anonymization")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["segments_processed"] == 2
+    assert data["segments_anonymized"] == 1
+
+    response = await client.get(f"/api/v1/jobs/{completed_job.id}/transcript")
+    texts = [s["anonymized_text"] for s in response.json()["segments"]]
+    assert texts == ["[X] och välkommen.", "Tack [PERSON]."]
+
+
+@pytest.mark.asyncio
+async def test_get_editable_transcript(
+    client: AsyncClient, test_db: AsyncSession, completed_job: Job
+) -> None:
+    """Test that words are grouped under their segments in order."""
+    segment = completed_job.segments[1]
+    test_db.add_all(
+        [
+            Word(segment_id=segment.id, word_index=1, start_time=3725.4, end_time=3725.5, text="Anna."),
+            Word(segment_id=segment.id, word_index=0, start_time=3725.25, end_time=3725.4, text="Tack"),
+        ]
+    )
+    await test_db.commit()
+
+    response = await client.get(f"/api/v1/editor/{completed_job.id}/editable-transcript")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["file_name"] == "intervju.mp3"
+    assert data["segments"][0]["words"] == []
+    words = data["segments"][1]["words"]
+    assert [w["text"] for w in words] == ["Tack", "Anna."]
+    assert words[0]["included"] is True
+    assert words[1]["start_time"] == 3725.4
+
+
+@pytest.mark.asyncio
+async def test_get_job(client: AsyncClient, completed_job: Job) -> None:
+    """Test fetching a single job and finding it in the job list."""
+    response = await client.get(f"/api/v1/jobs/{completed_job.id}")
+    assert response.status_code == 200
+    job = response.json()
+    assert job["status"] == "completed"
+    assert job["duration_seconds"] == 3725.5
+
+    response = await client.get("/api/v1/jobs")
+    assert response.json()["jobs"] == [job]
+
+    response = await client.get("/api/v1/jobs/nonexistent-id")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_word_inclusion(
+    client: AsyncClient, test_db: AsyncSession, completed_job: Job
+) -> None:
+    """Test excluding words and ignoring ids outside the job."""
+    segment = completed_job.segments[0]
+    words = [
+        Word(segment_id=segment.id, word_index=i, start_time=i, end_time=i + 0.5, text=text)
+        for i, text in enumerate(["Hej", "och", "välkommen."])
+    ]
+    test_db.add_all(words)
+    await test_db.commit()
+
+    url = f"/api/v1/editor/{completed_job.id}/words/edit"
+    response = await client.post(
+        url, json={"word_ids": [words[0].id, words[1].id, words[1].id, 999999], "included": False}
+    )
+    assert response.status_code == 200
+    assert response.json()["updated_count"] == 2
+
+    response = await client.get(f"/api/v1/editor/{completed_job.id}/editable-transcript")
+    included = [w["included"] for w in response.json()["segments"][0]["words"]]
+    assert included == [False, False, True]
+
+    response = await client.post(url, json={"word_ids": [999999], "included": False})
+    assert response.status_code == 404
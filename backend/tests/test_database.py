@@ -0,0 +1,94 @@
+"""Schema migration tests."""
+
+import json
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.database import SCHEMA_VERSION, migrate_schema
+from app.models.base import Base
+
+# Tables as created by the first release, before user_version was used
+LEGACY_SCHEMA = (
+    "CREATE TABLE jobs (id VARCHAR(36) PRIMARY KEY, name VARCHAR(255), "
+    "file_name VARCHAR(255) NOT NULL, file_path VARCHAR(500) NOT NULL, "
+    "file_size INTEGER NOT NULL, duration_seconds FLOAT, model VARCHAR(100), "
+    "enable_diarization BOOLEAN, enable_anonymization BOOLEAN, language VARCHAR(10), "
+    "ner_entity_types VARCHAR(200), status VARCHAR(10) NOT NULL, progress INTEGER, "
+    "current_step VARCHAR(50), error_message TEXT, created_at DATETIME, "
+    "started_at DATETIME, completed_at DATETIME, speaker_count INTEGER, "
+    "word_count INTEGER, segment_count INTEGER)",
+    "CREATE TABLE segments (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "job_id VARCHAR(36) NOT NULL REFERENCES jobs (id) ON DELETE CASCADE, "
+    "segment_index INTEGER NOT NULL, start_time FLOAT NOT NULL, end_time FLOAT NOT NULL, "
+    "text TEXT NOT NULL, anonymized_text TEXT, speaker VARCHAR(50), confidence FLOAT)",
+    "CREATE TABLE words (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "segment_id INTEGER NOT NULL REFERENCES segments (id) ON DELETE CASCADE, "
+    "word_index INTEGER NOT NULL, start_time FLOAT NOT NULL, end_time FLOAT NOT NULL, "
+    "text VARCHAR(200) NOT NULL, confidence FLOAT, included BOOLEAN NOT NULL)",
+    "INSERT INTO jobs (id, file_name, file_path, file_size, ner_entity_types, status) "
+    "VALUES ('a', 'a.mp3', '/x/a.mp3', 1, 'persons,dates', 'COMPLETED'), "
+    "('b', 'b.mp3', '/x/b.mp3', 1, NULL, 'COMPLETED')",
+    "INSERT INTO segments (job_id, segment_index, start_time, end_time, text) "
+    "VALUES ('a', 0, 0.0, 1.0, 'Hej Anna')",
+    "INSERT INTO words (segment_id, word_index, start_time, end_time, text, confidence, included) "
+    "VALUES (1, 0, 0.1234, 0.5, 'Hej', 0.876, 1), (1, 1, 0.5, 0.9996, 'Anna', NULL, 0)",
+)
+
+
+async def _columns(conn, table: str) -> set[str]:
+    return {row[1] for row in await conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_database() -> None:
+    """Test upgrading a first-release database to the current schema."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.execute(text(statement))
+
+        # Same order as init_db
+        await conn.run_sync(Base.metadata.create_all)
+        await migrate_schema(conn)
+
+        assert (await conn.execute(text("PRAGMA user_version"))).scalar() == SCHEMA_VERSION == 5
+        assert "enable_word_timestamps" in await _columns(conn, "jobs")
+        assert not {"start_time", "end_time", "confidence"} & await _columns(conn, "words")
+
+        words = (
+            await conn.execute(text(
+                "SELECT start_time_ms, end_time_ms, confidence_pct, included "
+                "FROM words ORDER BY word_index"
+            ))
+        ).all()
+        assert [tuple(w) for w in words] == [(123, 500, 88, 1), (500, 1000, None, 0)]
+
+        ner = dict(
+            (await conn.execute(text("SELECT id, ner_entity_types FROM jobs"))).all()
+        )
+        assert json.loads(ner["a"]) == {
+            "persons": True,
+            "locations": False,
+            "organizations": False,
+            "dates": True,
+            "events": False,
+        }
+        assert ner["b"] is None
+
+        # A second run is a no-op
+        await migrate_schema(conn)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_migrate_new_database() -> None:
+    """Test that a database created from the models passes every migration step."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await migrate_schema(conn)
+        assert (await conn.execute(text("PRAGMA user_version"))).scalar() == SCHEMA_VERSION
+        assert "start_time_ms" in await _columns(conn, "words")
+    await engine.dispose()
@@ -0,0 +1,91 @@
+"""Speaker assignment tests."""
+
+import random
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from app.services.diarization import _OVERLAP_BLOCK_SIZE, _assign_segment_speakers  # noqa: E402
+
+
+def whisperx_segment_speakers(diarize_df, segments: list[dict]) -> list[str]:
+    """Segment-level part of whisperx.assign_word_speakers, which this replaced."""
+    import numpy as np
+
+    labels = []
+    for seg in segments:
+        diarize_df["intersection"] = np.minimum(diarize_df["end"], seg["end"]) - np.maximum(
+            diarize_df["start"], seg["start"]
+        )
+        dia_tmp = diarize_df[diarize_df["intersection"] > 0]
+        speaker = ""
+        if len(dia_tmp) > 0:
+            speaker = (
+                dia_tmp.groupby("speaker")["intersection"]
+                .sum()
+                .sort_values(ascending=False)
+                .index[0]
+            )
+        labels.append(speaker)
+    return labels
+
+
+def _turns(rows: list[tuple[float, float, str]]):
+    return pd.DataFrame(rows, columns=["start", "end", "speaker"])
+
+
+def _assert_matches_whisperx(turns: list[tuple[float, float, str]], segments: list[dict]) -> list:
+    labels = _assign_segment_speakers(_turns(turns), segments).tolist()
+    assert labels == whisperx_segment_speakers(_turns(turns), segments)
+    return labels
+
+
+def test_overlapping_turns() -> None:
+    """Test that the speaker with the largest total overlap wins."""
+    turns = [
+        (0.0, 4.0, "SPEAKER_00"),
+        (3.0, 6.0, "SPEAKER_01"),
+        (6.0, 7.0, "SPEAKER_00"),
+        (7.0, 8.0, "SPEAKER_01"),
+        (8.0, 9.5, "SPEAKER_00"),
+    ]
+    segments = [
+        {"start": 0.5, "end": 3.5},  # mostly SPEAKER_00
+        {"start": 3.2, "end": 6.0},  # inside overlapping turns, mostly SPEAKER_01
+        {"start": 6.0, "end": 9.0},  # SPEAKER_00 over two turns beats one SPEAKER_01 turn
+    ]
+    assert _assert_matches_whisperx(turns, segments) == ["SPEAKER_00", "SPEAKER_01", "SPEAKER_00"]
+
+
+def test_segments_without_overlap() -> None:
+    """Test that segments no turn overlaps get no speaker."""
+    turns = [(1.0, 2.0, "SPEAKER_00"), (5.0, 6.0, "SPEAKER_01")]
+    segments = [
+        {"start": 0.0, "end": 1.0},  # touches a turn but does not overlap it
+        {"start": 2.5, "end": 4.5},
+        {"start": 5.5, "end": 7.0},
+    ]
+    assert _assert_matches_whisperx(turns, segments) == ["", "", "SPEAKER_01"]
+    assert _assign_segment_speakers(_turns([]), segments).tolist() == ["", "", ""]
+
+
+def test_tied_speakers() -> None:
+    """Test that equal overlaps resolve to the same speaker as whisperx."""
+    turns = [(0.0, 1.0, "SPEAKER_01"), (1.0, 2.0, "SPEAKER_00"), (2.0, 3.0, "SPEAKER_02")]
+    segments = [{"start": 0.5, "end": 1.5}, {"start": 1.5, "end": 2.5}]
+    assert _assert_matches_whisperx(turns, segments) == ["SPEAKER_00", "SPEAKER_00"]
+
+
+def test_matches_whisperx_across_blocks() -> None:
+    """Test random turns and segments spanning several overlap blocks."""
+    rng = random.Random(1)
+    turns = []
+    for _ in range(120):
+        start = rng.uniform(0, 600)
+        turns.append((start, start + rng.uniform(0.5, 20), f"SPEAKER_0{rng.randrange(4)}"))
+    segments = []
+    for _ in range(2 * _OVERLAP_BLOCK_SIZE + 17):
+        start = rng.uniform(0, 620)
+        segments.append({"start": start, "end": start + rng.uniform(0.2, 8)})
+    _assert_matches_whisperx(turns, segments)
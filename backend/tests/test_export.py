@@ -0,0 +1,92 @@
+"""Export endpoint tests."""
+
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.export import format_srt_timestamp, format_timestamp, format_vtt_timestamp
+from app.models.job import Job
+
+
+@pytest.mark.asyncio
+async def test_export_json(client: AsyncClient, completed_job: Job) -> None:
+    """Test that the streamed JSON export is a complete document."""
+    response = await client.get(
+        f"/api/v1/jobs/{completed_job.id}/export",
+        params={"format": "json", "anonymized": True},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data["job_id"] == completed_job.id
+    assert data["anonymized"] is True
+    assert [s["index"] for s in data["segments"]] == [0, 1]
+    assert data["segments"][1]["text"] == "Tack [PERSON]."
+    assert data["metadata"] == {"speaker_count": 2, "word_count": 5, "segment_count": 2}
+
+
+@pytest.mark.asyncio
+async def test_export_unknown_format(client: AsyncClient, completed_job: Job) -> None:
+    """Test that an unknown export format is rejected."""
+    response = await client.get(
+        f"/api/v1/jobs/{completed_job.id}/export", params={"format": "docx"}
+    )
+    assert response.status_code == 400
+
+
+def test_timestamp_formatting() -> None:
+    """Test timestamp formatting for the text and subtitle exports."""
+    assert format_timestamp(0) == "00:00"
+    assert format_timestamp(59.999) == "00:59"
+    assert format_timestamp(3725.5) == "01:02:05"
+    assert format_srt_timestamp(3725.25) == "01:02:05,250"
+    # Float modulo would give 299 ms here
+    assert format_srt_timestamp(2.3) == "00:00:02,300"
+    assert format_vtt_timestamp(61.007) == "00:01:01.007"
+
+
+@pytest.mark.asyncio
+async def test_audio_range_request(
+    client: AsyncClient, completed_job: Job, test_db: AsyncSession, tmp_path: Path
+) -> None:
+    """Test that the audio endpoint serves byte ranges for seeking."""
+    audio_file = tmp_path / "intervju.mp3"
+    audio_file.write_bytes(bytes(range(256)) * 4)
+    completed_job.file_path = str(audio_file)
+    await test_db.commit()
+
+    response = await client.get(
+        f"/api/v1/jobs/{completed_job.id}/audio", headers={"Range": "bytes=100-199"}
+    )
+    assert response.status_code == 206
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.content == audio_file.read_bytes()[100:200]
+
+
+@pytest.mark.asyncio
+async def test_audio_not_modified(
+    client: AsyncClient, completed_job: Job, test_db: AsyncSession, tmp_path: Path
+) -> None:
+    """Test that a matching If-None-Match gives 304 without a body."""
+    audio_file = tmp_path / "intervju.mp3"
+    audio_file.write_bytes(b"ID3" + bytes(100))
+    completed_job.file_path = str(audio_file)
+    await test_db.commit()
+
+    url = f"/api/v1/jobs/{completed_job.id}/audio"
+    first = await client.get(url)
+    etag = first.headers["etag"]
+
+    second = await client.get(url, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_audio_missing_file(client: AsyncClient, completed_job: Job) -> None:
+    """Test that a missing audio file gives 404."""
+    response = await client.get(f"/api/v1/jobs/{completed_job.id}/audio")
+    assert response.status_code == 404
@@ -0,0 +1,47 @@
+"""Transcription worker process tests."""
+
+import asyncio
+import time
+from functools import partial
+
+import pytest
+
+from app.workers import transcription_worker
+
+
+def sleep_and_return(seconds: float, value: str) -> str:
+    """Stand-in for a transcription job."""
+    time.sleep(seconds)
+    return value
+
+
+@pytest.mark.asyncio
+async def test_timeout_leaves_concurrent_job_running(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a timed-out job only terminates its own worker process."""
+    monkeypatch.setattr(transcription_worker, "get_max_concurrent_jobs", lambda: 2)
+    monkeypatch.setattr(transcription_worker, "_job_slots", None)
+    monkeypatch.setattr(transcription_worker, "_workers", set())
+    monkeypatch.setattr(transcription_worker, "_idle_workers", [])
+    run = transcription_worker.run_in_worker
+
+    try:
+        stuck = asyncio.create_task(run(partial(sleep_and_return, 60, "stuck"), timeout=4))
+        other = asyncio.create_task(run(partial(sleep_and_return, 5, "done"), timeout=60))
+        await asyncio.sleep(0.5)
+        workers = set(transcription_worker._workers)
+        assert len(workers) == 2
+
+        with pytest.raises(asyncio.TimeoutError):
+            await stuck
+        [other_worker] = transcription_worker._workers
+        [stuck_worker] = workers - {other_worker}
+        assert not other.done() and other_worker.process.is_alive()
+        assert await other == "done"
+
+        stuck_worker.process.join(5)
+        assert not stuck_worker.process.is_alive()
+        # The finished worker is kept for the next job
+        assert transcription_worker._idle_workers == [other_worker]
+        assert await run(partial(sleep_and_return, 0, "again"), timeout=60) == "again"
+    finally:
+        transcription_worker.shutdown_workers()
@@ -9,6 +9,8 @@ Prerequisites (run once):
 Usage:
     python build_exe.py
 
+    Set UPX_DIR to a UPX installation to compress the smaller binaries.
+
 Output:
     dist/TystText/TystText.exe   (+ supporting files)
 """
@@ -16,14 +18,30 @@ Output:
 import os
 import subprocess
 import sys
+import zipfile
 from pathlib import Path
 
 ROOT = Path(__file__).parent
 FRONTEND_DIR = ROOT / "frontend"
 FRONTEND_OUT = FRONTEND_DIR / "out"
 BACKEND_DIR = ROOT / "backend"
+# Frontend packed into a single file so PyInstaller copies one file instead of
+# hundreds of chunks; the launcher extracts it on first start
+FRONTEND_ZIP = ROOT / "build" / "frontend.zip"
 SEP = os.pathsep  # Path separator for --add-data (';' on Windows, ':' on Linux/Mac)
 
+# Template for data/.env in the distribution (ASCII only)
+_ENV_TEMPLATE_BYTES = (
+    b"# TystText - Installningar\n"
+    b"#\n"
+    b"# For talaridentifiering (valfritt):\n"
+    b"# 1. Skapa konto pa https://huggingface.co\n"
+    b"# 2. Ga till https://huggingface.co/settings/tokens\n"
+    b"# 3. Skapa en token och klistra in nedan:\n"
+    b"#\n"
+    b"# HF_TOKEN=hf_din_token_har\n"
+)
+
 
 def check_prerequisites() -> None:
     """Verify everything needed for the build is in place."""
@@ -65,6 +83,32 @@ def build_frontend() -> None:
     print("[OK] Frontend byggd.")
 
 
+def compile_backend() -> None:
+    """
+    Byte-compile the backend before packaging.
+
+    PyInstaller bundles bytecode, but silently leaves out modules that fail
+    to compile; compiling first stops the build on syntax errors instead.
+    """
+    print("[...] Kompilerar backend...")
+    subprocess.run(
+        [sys.executable, "-m", "compileall", "-q", "-o", "1", str(BACKEND_DIR / "app")],
+        check=True,
+    )
+    print("[OK] Backend kompilerad.")
+
+
+def package_frontend() -> None:
+    """Pack the built frontend into a single zip for bundling."""
+    FRONTEND_ZIP.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(FRONTEND_ZIP, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for root, _, files in os.walk(FRONTEND_OUT):
+            for name in files:
+                path = Path(root) / name
+                zf.write(path, path.relative_to(FRONTEND_OUT).as_posix())
+    print(f"[OK] Frontend packad: {FRONTEND_ZIP.name}")
+
+
 def run_pyinstaller() -> None:
     """Run PyInstaller to create the exe."""
     print("[...] Bygger exe med PyInstaller...")
@@ -74,12 +118,15 @@ def run_pyinstaller() -> None:
         "-m",
         "PyInstaller",
         "--name=TystText",
-        "--onedir",
+        "--onedir",  # onefile would unpack everything to a temp dir on every start
         "--console",
+        # Strip asserts from bundled bytecode. Level 2 (docstrings) is avoided
+        # since some libraries build their docstrings at import time.
+        "--optimize=1",
         # Tell PyInstaller where to find the 'app' package
         f"--paths={BACKEND_DIR}",
-        # Bundle frontend static files
-        f"--add-data={FRONTEND_OUT}{SEP}frontend/out",
+        # Bundle frontend static files (extracted by the launcher)
+        f"--add-data={FRONTEND_ZIP}{SEP}.",
         # Hidden imports: uvicorn internals (string-based imports)
         "--hidden-import=uvicorn.logging",
         "--hidden-import=uvicorn.protocols",
@@ -94,36 +141,6 @@ def run_pyinstaller() -> None:
         "--hidden-import=uvicorn.lifespan",
         "--hidden-import=uvicorn.lifespan.on",
         "--hidden-import=uvicorn.lifespan.off",
-        # Hidden imports: our app modules (loaded via string in uvicorn.run)
-        "--hidden-import=app",
-        "--hidden-import=app.main",
-        "--hidden-import=app.config",
-        "--hidden-import=app.db",
-        "--hidden-import=app.db.database",
-        "--hidden-import=app.api",
-        "--hidden-import=app.api.v1",
-        "--hidden-import=app.api.v1.router",
-        "--hidden-import=app.api.v1.jobs",
-        "--hidden-import=app.api.v1.upload",
-        "--hidden-import=app.api.v1.export",
-        "--hidden-import=app.api.v1.models",
-        "--hidden-import=app.api.v1.anonymize",
-        "--hidden-import=app.api.v1.templates",
-        "--hidden-import=app.api.v1.editor",
-        "--hidden-import=app.models",
-        "--hidden-import=app.models.base",
-        "--hidden-import=app.models.job",
-        "--hidden-import=app.models.segment",
-        "--hidden-import=app.schemas",
-        "--hidden-import=app.schemas.job",
-        "--hidden-import=app.schemas.segment",
-        "--hidden-import=app.schemas.upload",
-        "--hidden-import=app.services",
-        "--hidden-import=app.services.transcription",
-        "--hidden-import=app.services.diarization",
-        "--hidden-import=app.services.anonymization",
-        "--hidden-import=app.workers",
-        "--hidden-import=app.workers.transcription_worker",
         # Hidden imports: libraries with dynamic loading
         "--hidden-import=multipart",
         "--hidden-import=aiosqlite",
@@ -135,6 +152,10 @@ def run_pyinstaller() -> None:
         "--exclude-module=mypy",
         "--exclude-module=tkinter",
         "--exclude-module=matplotlib",
+        "--exclude-module=IPython",
+        "--exclude-module=notebook",
+        "--exclude-module=tensorboard",
+        "--exclude-module=torch.utils.tensorboard",
         # Output directories
         f"--distpath={ROOT / 'dist'}",
         f"--workpath={ROOT / 'build'}",
@@ -145,6 +166,26 @@ def run_pyinstaller() -> None:
         str(ROOT / "launcher.py"),
     ]
 
+    # UPX is opt-in: compressed binaries must be unpacked in memory on every
+    # start, and CUDA/torch libraries break when compressed
+    upx_dir = os.environ.get("UPX_DIR")
+    if upx_dir:
+        cmd[-1:-1] = [
+            f"--upx-dir={upx_dir}",
+            "--upx-exclude=vcruntime140.dll",
+            "--upx-exclude=python3*.dll",
+            "--upx-exclude=torch*",
+            "--upx-exclude=c10*",
+            "--upx-exclude=cu*",
+            "--upx-exclude=ctranslate2*",
+        ]
+    else:
+        cmd.insert(-1, "--noupx")
+
+    # Symbol stripping needs binutils and is not recommended on Windows
+    if sys.platform != "win32":
+        cmd.insert(-1, "--strip")
+
     subprocess.run(cmd, check=True)
     print("[OK] Exe byggd!")
 
@@ -157,17 +198,7 @@ def create_data_template() -> None:
 
     env_file = data_dir / ".env"
     if not env_file.exists():
-        env_file.write_text(
-            "# TystText - Installningar\n"
-            "#\n"
-            "# For talaridentifiering (valfritt):\n"
-            "# 1. Skapa konto pa https://huggingface.co\n"
-            "# 2. Ga till https://huggingface.co/settings/tokens\n"
-            "# 3. Skapa en token och klistra in nedan:\n"
-            "#\n"
-            "# HF_TOKEN=hf_din_token_har\n",
-            encoding="utf-8",
-        )
+        env_file.write_bytes(_ENV_TEMPLATE_BYTES)
     print(f"[OK] Data-mapp skapad: {data_dir}")
 
 
@@ -197,6 +228,8 @@ def main() -> None:
 
     check_prerequisites()
     build_frontend()
+    compile_backend()
+    package_frontend()
     run_pyinstaller()
     create_data_template()
     print_summary()
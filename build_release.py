@@ -12,7 +12,10 @@ Creates TystText-Backend.zip containing only what's needed:
 Excludes: venv, __pycache__, .db, uploads, models, .env, etc.
 """
 
+import os
 import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).parent
@@ -28,16 +31,22 @@ SKIP_DIRS = {
 SKIP_EXTENSIONS = {".pyc", ".pyo", ".db", ".sqlite", ".sqlite3", ".log", ".spec"}
 SKIP_FILES = {".env", "config.txt", ".DS_Store", "Thumbs.db"}
 
+# Already compressed formats: deflating them again costs time for no gain
+STORED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".woff", ".woff2", ".zip"}
+COMPRESS_LEVEL = 6
 
-def should_include(path: Path, base: Path) -> bool:
-    """Check if a file should be included in the ZIP."""
-    rel = path.relative_to(base)
-    parts = set(rel.parts)
 
-    # Skip excluded directories
-    if parts & SKIP_DIRS:
-        return False
+def walk_files(base: Path, skip_dirs: set[str] = SKIP_DIRS) -> Iterator[Path]:
+    """Yield all files under base, without descending into skipped directories."""
+    for root, dirs, files in os.walk(base):
+        dirs[:] = [d for d in dirs if d not in skip_dirs]
+        root_path = Path(root)
+        for name in files:
+            yield root_path / name
+
 
+def should_include(path: Path) -> bool:
+    """Check if a file should be included in the ZIP (directories are pruned by walk_files)."""
     # Skip by extension
     if path.suffix in SKIP_EXTENSIONS:
         return False
@@ -61,8 +70,8 @@ def build_zip() -> None:
     files_to_add: list[tuple[Path, str]] = []
 
     # 1. Backend application code
-    for path in app_dir.rglob("*"):
-        if path.is_file() and should_include(path, backend_dir):
+    for path in walk_files(app_dir):
+        if should_include(path):
             arcname = f"{PREFIX}/backend/{path.relative_to(backend_dir)}"
             files_to_add.append((path, arcname))
 
@@ -75,10 +84,10 @@ def build_zip() -> None:
     # 3. Pre-built frontend
     frontend_out = ROOT / "frontend" / "out"
     if frontend_out.is_dir():
-        for path in frontend_out.rglob("*"):
-            if path.is_file():
-                arcname = f"{PREFIX}/frontend/out/{path.relative_to(frontend_out)}"
-                files_to_add.append((path, arcname))
+        # The build output is included as-is, without pruning
+        for path in walk_files(frontend_out, skip_dirs=set()):
+            arcname = f"{PREFIX}/frontend/out/{path.relative_to(frontend_out)}"
+            files_to_add.append((path, arcname))
         print(f"  [OK] Frontend inkluderad fran frontend/out/")
     else:
         print(f"  [VARNING] frontend/out/ hittades inte - bygg frontend forst!")
@@ -90,11 +99,23 @@ def build_zip() -> None:
         if fpath.is_file():
             files_to_add.append((fpath, f"{PREFIX}/{fname}"))
 
-    # Build the ZIP
-    with zipfile.ZipFile(OUTPUT, "w", zipfile.ZIP_DEFLATED) as zf:
-        for filepath, arcname in sorted(files_to_add, key=lambda x: x[1]):
-            zf.write(filepath, arcname)
-            print(f"  + {arcname}")
+    # Build the ZIP. File contents are read in parallel; zipfile only
+    # supports one writer at a time, so members are written sequentially.
+    files_to_add.sort(key=lambda x: x[1])
+    with ThreadPoolExecutor() as pool:
+        contents = pool.map(lambda item: item[0].read_bytes(), files_to_add)
+
+        with zipfile.ZipFile(
+            OUTPUT, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL
+        ) as zf:
+            for (filepath, arcname), data in zip(files_to_add, contents):
+                info = zipfile.ZipInfo.from_file(filepath, arcname)
+                if filepath.suffix.lower() in STORED_EXTENSIONS:
+                    info.compress_type = zipfile.ZIP_STORED
+                else:
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, data, compresslevel=COMPRESS_LEVEL)
+                print(f"  + {arcname}")
 
     size_kb = OUTPUT.stat().st_size / 1024
     print(f"\n[OK] {OUTPUT.name} skapad ({size_kb:.0f} KB, {len(files_to_add)} filer)")
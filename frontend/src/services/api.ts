@@ -58,9 +58,13 @@ export async function createJob(data: JobCreateRequest): Promise<Job> {
   return response.data;
 }
 
-export async function listJobs(skip = 0, limit = 20): Promise<JobListResponse> {
+export async function listJobs(
+  skip = 0,
+  limit = 20,
+  cursor?: string
+): Promise<JobListResponse> {
   const response = await api.get<JobListResponse>("/jobs", {
-    params: { skip, limit },
+    params: cursor ? { cursor, limit } : { skip, limit },
   });
   return response.data;
 }
@@ -13,6 +13,7 @@ export interface Job {
   model: string;
   enable_diarization: boolean;
   enable_anonymization: boolean;
+  enable_word_timestamps: boolean;
   language: string;
   status: JobStatus;
   progress: number;
@@ -29,6 +30,8 @@ export interface Job {
 export interface JobListResponse {
   jobs: Job[];
   total: number;
+  total_is_exact: boolean;
+  next_cursor: string | null;
 }
 
 export interface Segment {
@@ -83,6 +86,7 @@ export interface JobCreateRequest {
   model: string;
   enable_diarization: boolean;
   enable_anonymization: boolean;
+  enable_word_timestamps?: boolean;
   language: string;
   ner_entity_types?: NerEntityTypesConfig;
 }
@@ -210,6 +214,8 @@ export interface WordTemplateCreate {
 export interface WordTemplateListResponse {
   templates: WordTemplate[];
   total: number;
+  total_is_exact: boolean;
+  next_cursor: string | null;
 }
 
 // Search types
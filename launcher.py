@@ -6,8 +6,10 @@ Sets up paths and environment, then starts the server and opens the browser.
 """
 
 import os
+import shutil
 import sys
 import threading
+import zipfile
 import webbrowser
 from pathlib import Path
 from time import sleep
@@ -27,6 +29,35 @@ def get_bundle_dir() -> Path:
     return Path(__file__).parent
 
 
+def extract_frontend(bundle_dir: Path, data_dir: Path) -> Path:
+    """
+    Extract the bundled frontend zip into the data dir.
+
+    The extracted copy is reused as long as the zip's size and mtime match,
+    so only the first start after an update pays for the extraction.
+    """
+    frontend_zip = bundle_dir / "frontend.zip"
+    if not frontend_zip.is_file():
+        # Dev mode: serve the build output directly
+        return bundle_dir / "frontend" / "out"
+
+    target = data_dir / "frontend"
+    stamp_file = target / ".stamp"
+    st = frontend_zip.stat()
+    stamp = f"{st.st_size}:{st.st_mtime_ns}"
+    try:
+        if stamp_file.read_text(encoding="utf-8") == stamp:
+            return target
+    except OSError:
+        pass
+
+    shutil.rmtree(target, ignore_errors=True)
+    with zipfile.ZipFile(frontend_zip) as zf:
+        zf.extractall(target)
+    stamp_file.write_text(stamp, encoding="utf-8")
+    return target
+
+
 def setup_environment() -> None:
     """Configure paths before importing the app."""
     app_dir = get_app_dir()
@@ -41,19 +72,23 @@ def setup_environment() -> None:
         "UPLOAD_DIR": str(data_dir / "uploads"),
         "MODELS_DIR": str(data_dir / "models"),
         "DATABASE_URL": f"sqlite+aiosqlite:///{data_dir / 'transcription.db'}",
-        "STATIC_DIR": str(bundle_dir / "frontend" / "out"),
+        "STATIC_DIR": str(extract_frontend(bundle_dir, data_dir)),
+        # Warm the diarization model in the worker while the browser opens
+        "PRELOAD_DIARIZATION": "1",
     }
     for key, value in defaults.items():
         os.environ.setdefault(key, value)
 
     # Load .env from data dir if it exists (for HF_TOKEN etc.)
-    env_file = data_dir / ".env"
-    if env_file.exists():
-        for line in env_file.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, _, value = line.partition("=")
-                os.environ.setdefault(key.strip(), value.strip())
+    try:
+        env_data = (data_dir / ".env").read_bytes()
+    except OSError:
+        env_data = b""
+    for raw_line in env_data.splitlines():
+        line = raw_line.strip()
+        if line and not line.startswith(b"#") and b"=" in line:
+            key, _, value = line.partition(b"=")
+            os.environ.setdefault(key.strip().decode("utf-8"), value.strip().decode("utf-8"))
 
     # Add backend to Python path so 'app' package is importable
     backend_path = str(bundle_dir / "backend")
@@ -86,11 +121,13 @@ def main() -> None:
     # Open browser in background
     threading.Thread(target=open_browser_delayed, daemon=True).start()
 
-    # Import after environment is set up
+    # Import after environment is set up. Importing the app object directly
+    # (instead of "app.main:app") lets PyInstaller discover the app modules.
     import uvicorn
+    from app.main import app
 
     uvicorn.run(
-        "app.main:app",
+        app,
         host="127.0.0.1",
         port=8000,
         log_level="warning",
@@ -98,4 +135,8 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Required for the transcription worker processes in the frozen executable
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     main()
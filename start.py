@@ -1,79 +1,452 @@
 #!/usr/bin/env python3
-"""Start TystText locally - builds frontend and launches the server."""
+"""
+Start TystText locally - builds frontend and launches the server.
 
+The frontend is only rebuilt when its sources change. Next.js keeps its
+incremental build cache in frontend/.next/cache, and finished builds are
+archived in ~/.cache/tysttext; delete those and frontend/out to force a
+clean rebuild.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import os
+import shutil
 import subprocess
 import sys
+import threading
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from time import sleep
+from typing import Iterator
 
-ROOT = Path(__file__).parent
+# Absolute, since the backend is imported with backend/ as working directory
+ROOT = Path(__file__).resolve().parent
 FRONTEND_DIR = ROOT / "frontend"
 BACKEND_DIR = ROOT / "backend"
 STATIC_DIR = FRONTEND_DIR / "out"
 
+# Resolved once. npm.cmd first: on Windows the npm directory also holds an
+# extensionless shell script named npm, which cannot be run directly
+NPM = shutil.which("npm.cmd") or shutil.which("npm")
+
+# Written with one call: every print to a console is a separate write, and
+# those are slow on Windows
+BANNER = "=" * 50 + "\n  TystText - Lokal transkribering\n" + "=" * 50 + "\n\n"
+
+# Environment for the local static build; part of the build hash
+BUILD_ENV = {
+    "BUILD_MODE": "local",
+    "NEXT_PUBLIC_APP_MODE": "local",
+    "NODE_ENV": "production",
+    "NEXT_TELEMETRY_DISABLED": "1",
+}
+
+# First Next.js release where "next build --turbopack" is supported; older
+# versions keep the default webpack build
+TURBOPACK_BUILD_MIN_NEXT = (15, 5)
+
+# Written only after a successful build: the newest input mtime (ns) at that
+# point, for a cheap check, and the hash of the inputs the build used
+BUILD_STAMP_FILE = STATIC_DIR / ".build-ok"
+
+# Archives of earlier builds of frontend/out/, keyed by the input hash, so a
+# fresh clone or a switch back to a built revision skips npm entirely
+BUILD_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "tysttext"
+BUILD_CACHE_KEEP = 3
 
-def run(cmd: list[str], cwd: Path) -> None:
-    """Run a command and exit on failure."""
+# Hash of the package-lock.json that node_modules was installed from
+LOCK_HASH_FILE = FRONTEND_DIR / "node_modules" / ".lock-hash"
+
+# Not build inputs: written by npm install / next build, or VCS metadata
+FRONTEND_GENERATED = {
+    "node_modules", ".next", "out", "next-env.d.ts", "tsconfig.tsbuildinfo", ".git"
+}
+
+
+def run(cmd: list[str], cwd: Path, env: dict[str, str] | None = None) -> None:
+    """Run a command with its output going straight to the console, and exit on failure."""
     print(f"  > {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=cwd)
+    try:
+        # The child stays in the console's process group, so Ctrl+C already
+        # stops npm and every process it started
+        result = subprocess.run(cmd, cwd=cwd, env=env)
+    except KeyboardInterrupt:
+        # Exit quietly instead of with a traceback
+        print("\nAvbrutet.")
+        sys.exit(130)
     if result.returncode != 0:
         print(f"Kommandot misslyckades med kod {result.returncode}")
         sys.exit(1)
 
 
+def _iter_frontend_inputs(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield the files and directories the frontend build reads from.
+
+    Uses os.scandir, whose entries carry the file type from the directory
+    listing, and never descends into generated directories.
+    """
+    pending = [os.fspath(root)]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            if entry.name in FRONTEND_GENERATED:
+                continue
+            yield entry
+            if entry.is_dir(follow_symlinks=False):
+                pending.append(entry.path)
+
+
+def _file_digest(path: str) -> bytes:
+    """blake2b digest of one file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).digest()
+
+
+def _frontend_state_hash() -> str:
+    """Hash the frontend sources, lockfile and build environment."""
+    digest = hashlib.blake2b(digest_size=16)
+    for key, value in sorted(BUILD_ENV.items()):
+        digest.update(f"{key}={value}\0".encode())
+
+    paths = [entry.path for entry in _iter_frontend_inputs(FRONTEND_DIR) if entry.is_file()]
+    # Files are read and hashed in parallel; hashlib releases the GIL on large buffers.
+    # map() keeps the walk order, so the combined hash is stable.
+    with ThreadPoolExecutor() as pool:
+        for path, file_digest in zip(paths, pool.map(_file_digest, paths)):
+            name = Path(os.path.relpath(path, FRONTEND_DIR)).as_posix()
+            digest.update(f"{name}\0".encode() + file_digest)
+
+    return digest.hexdigest()
+
+
+def _latest_mtime(root: Path) -> int:
+    """Newest mtime (ns) under root; directories count too, so deletions are seen."""
+    latest = root.stat().st_mtime_ns
+    for entry in _iter_frontend_inputs(root):
+        latest = max(latest, entry.stat(follow_symlinks=False).st_mtime_ns)
+    return latest
+
+
+def _atomic_write(path: Path, data: str) -> None:
+    """
+    Write a file through a temporary file and os.replace.
+
+    An interrupted write leaves the old file or none, never a truncated one
+    that a later start could mistake for a valid cache stamp.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(data, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _read_build_file(path: Path) -> str | None:
+    """Return a value stored with the last successful build, if any."""
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def _lockfile_hash() -> str | None:
+    """Hash package-lock.json, or None when there is none."""
+    try:
+        data = (FRONTEND_DIR / "package-lock.json").read_bytes()
+    except FileNotFoundError:
+        return None
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def install_dependencies(npm: str) -> None:
+    """Install npm packages unless node_modules was installed from the current lockfile."""
+    lock_hash = _lockfile_hash()
+    if lock_hash is not None and _read_build_file(LOCK_HASH_FILE) == lock_hash:
+        print("[OK] npm-paket redan installerade.")
+        return
+
+    # npm ci installs exactly the lockfile without resolving; the cache is
+    # used before the registry. Without a lockfile only npm install works.
+    if lock_hash is not None:
+        run([npm, "ci", "--prefer-offline", "--no-audit", "--no-fund"], cwd=FRONTEND_DIR)
+    else:
+        run([npm, "install", "--no-audit", "--no-fund"], cwd=FRONTEND_DIR)
+
+    # Hashed after installing, since npm install may rewrite package-lock.json
+    lock_hash = _lockfile_hash()
+    if lock_hash is not None:
+        _atomic_write(LOCK_HASH_FILE, lock_hash)
+
+
+def _installed_next_version() -> tuple[int, ...] | None:
+    """Version of the installed next package, None if it cannot be read."""
+    import json
+
+    try:
+        with open(FRONTEND_DIR / "node_modules" / "next" / "package.json", encoding="utf-8") as f:
+            version = json.load(f)["version"]
+        return tuple(int(part) for part in version.split("-")[0].split("."))
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def _read_build_stamp() -> tuple[int, str] | None:
+    """Return (newest input mtime, input hash) of the last successful build, if any."""
+    try:
+        built_mtime, built_hash = BUILD_STAMP_FILE.read_text(encoding="utf-8").split()
+        return int(built_mtime), built_hash
+    except (OSError, ValueError):
+        return None
+
+
+def _write_build_stamp(latest_mtime: int, state_hash: str) -> None:
+    """Record a successful build."""
+    _atomic_write(BUILD_STAMP_FILE, f"{latest_mtime} {state_hash}\n")
+
+
+def _frontend_is_current() -> bool:
+    """Check whether frontend/out/ holds a complete build of the current sources."""
+    stamp = _read_build_stamp()
+    if stamp is None:
+        return False
+    built_mtime, built_hash = stamp
+
+    # Fast path: nothing was touched since the last build, only stat() calls
+    latest = _latest_mtime(FRONTEND_DIR)
+    if latest <= built_mtime:
+        return True
+
+    # Files were touched (e.g. a git checkout); compare contents before rebuilding
+    if _frontend_state_hash() != built_hash:
+        return False
+    _write_build_stamp(latest, built_hash)
+    return True
+
+
+def _cached_build_path(state_hash: str) -> Path:
+    """Archive of the build made from inputs with this hash."""
+    return BUILD_CACHE_DIR / f"out-{state_hash}.tar.gz"
+
+
+def _restore_cached_build(state_hash: str) -> bool:
+    """Unpack a cached build of these inputs into frontend/out/; False if there is none."""
+    import tarfile
+
+    archive = _cached_build_path(state_hash)
+    if not archive.is_file():
+        return False
+    archive.touch()  # Most recently used archives survive pruning
+    shutil.rmtree(STATIC_DIR, ignore_errors=True)
+    try:
+        with tarfile.open(archive) as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(FRONTEND_DIR, filter="data")
+            else:
+                tar.extractall(FRONTEND_DIR)
+    except (OSError, tarfile.TarError):
+        # Without a build stamp the partial out/ is rebuilt below
+        return False
+    _write_build_stamp(_latest_mtime(FRONTEND_DIR), state_hash)
+    return True
+
+
+def _save_build_to_cache(state_hash: str) -> None:
+    """Archive frontend/out/ and keep only the newest few archives."""
+    import tarfile
+
+    archive = _cached_build_path(state_hash)
+    tmp_path = archive.with_name(archive.name + ".tmp")
+    # Restoring writes a fresh stamp
+    stamp_name = f"{STATIC_DIR.name}/{BUILD_STAMP_FILE.name}"
+    try:
+        BUILD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Fast compression: the archive only has to beat npm, not save disk
+        with tarfile.open(tmp_path, "w:gz", compresslevel=1) as tar:
+            tar.add(
+                STATIC_DIR,
+                arcname=STATIC_DIR.name,
+                filter=lambda info: None if info.name == stamp_name else info,
+            )
+        os.replace(tmp_path, archive)
+
+        archives = sorted(
+            BUILD_CACHE_DIR.glob("out-*.tar.gz"), key=lambda p: p.stat().st_mtime, reverse=True
+        )
+        for old in archives[BUILD_CACHE_KEEP:]:
+            old.unlink()
+    except (OSError, tarfile.TarError):
+        pass  # The cache is only an optimization
+
+
 def build_frontend() -> None:
     """Build the Next.js frontend as static files for local app mode."""
-    if STATIC_DIR.is_dir() and (STATIC_DIR / "index.html").is_file():
-        print("[OK] Frontend redan byggd. Ta bort frontend/out/ for att bygga om.")
+    if _frontend_is_current():
+        print("[OK] Frontend redan byggd och oforandrad.")
         return
 
-    print("[...] Bygger frontend (lokal app-lage)...")
-    npm = "npm.cmd" if sys.platform == "win32" else "npm"
-    import os
-    env = {**os.environ, "BUILD_MODE": "local", "NEXT_PUBLIC_APP_MODE": "local"}
-    run([npm, "install"], cwd=FRONTEND_DIR)
+    if _restore_cached_build(_frontend_state_hash()):
+        print("[OK] Frontend hamtad fran tidigare bygge.")
+        return
 
-    print(f"  > {npm} run build")
-    result = subprocess.run([npm, "run", "build"], cwd=FRONTEND_DIR, env=env)
-    if result.returncode != 0:
-        print(f"Kommandot misslyckades med kod {result.returncode}")
+    print("[...] Bygger frontend (lokal app-lage)...")
+    if NPM is None:
+        print("npm hittades inte. Installera Node.js och forsok igen.")
         sys.exit(1)
 
+    env = os.environ.copy()
+    env.update(BUILD_ENV)
+    install_dependencies(NPM)
+
+    build_cmd = [NPM, "run", "build"]
+    if (_installed_next_version() or (0,)) >= TURBOPACK_BUILD_MIN_NEXT:
+        build_cmd += ["--", "--turbopack"]
+    run(build_cmd, cwd=FRONTEND_DIR, env=env)
+
+    # Recorded after the build, since npm install may rewrite package-lock.json
+    state_hash = _frontend_state_hash()
+    _write_build_stamp(_latest_mtime(FRONTEND_DIR), state_hash)
+    _save_build_to_cache(state_hash)
     print("[OK] Frontend byggd.")
 
 
+# Set once the background backend import has finished (or failed)
+backend_imported = threading.Event()
+
+
+def _prepare_backend_import() -> None:
+    """Make the backend importable here the way uvicorn run from backend/ sees it."""
+    # Settings resolve .env, uploads/ and the database relative to the working directory
+    os.chdir(BACKEND_DIR)
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+
+# Everything app.main imports. app.main itself is imported only after the
+# build, since it registers the frontend routes only if frontend/out exists
+BACKEND_WARM_UP_MODULES = ("app.api.v1.router", "app.workers.transcription_worker")
+
+
+def _warm_up_backend() -> None:
+    """Byte-compile and import the backend modules while the frontend builds."""
+    import compileall
+
+    try:
+        # Covers app.main too, which is imported only after the build; files
+        # with an up-to-date .pyc are skipped
+        compileall.compile_dir(str(BACKEND_DIR / "app"), quiet=1)
+        for module in BACKEND_WARM_UP_MODULES:
+            importlib.import_module(module)
+    except Exception:
+        pass  # Raised again, and reported, when the server imports the app
+    finally:
+        backend_imported.set()
+
+
+def _port_in_use() -> bool:
+    """Check whether something already accepts connections on port 8000."""
+    import socket
+
+    with socket.socket() as sock:
+        sock.settimeout(0.1)
+        return sock.connect_ex(("127.0.0.1", 8000)) == 0
+
+
+def _is_tysttext_server() -> bool:
+    """Check whether the server on port 8000 answers our health check."""
+    import json
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen("http://localhost:8000/health", timeout=2) as response:
+            return json.load(response).get("status") == "ok"
+    except (OSError, ValueError):
+        return False
+
+
 def start_server() -> None:
     """Start the FastAPI backend server."""
-    print("[...] Startar server pa http://localhost:8000")
-    print("      Tryck Ctrl+C for att avsluta.\n")
-
-    # Open browser once the server is actually responding
-    def open_browser() -> None:
-        import urllib.request
-        import urllib.error
-        for _ in range(30):
-            try:
-                urllib.request.urlopen("http://localhost:8000/health", timeout=2)
-                break
-            except (urllib.error.URLError, OSError):
-                sleep(1)
+    # A previous instance may still be running; reuse it instead of failing to bind
+    if _port_in_use():
+        if not _is_tysttext_server():
+            print("[!] Port 8000 anvands redan av ett annat program.")
+            sys.exit(1)
+        print("[OK] TystText kor redan pa http://localhost:8000")
         webbrowser.open("http://localhost:8000")
+        return
+
+    sys.stdout.write(
+        "[...] Startar server pa http://localhost:8000\n"
+        "      Tryck Ctrl+C for att avsluta.\n\n"
+    )
 
-    import threading
-    threading.Thread(target=open_browser, daemon=True).start()
+    if _serve_in_process():
+        return
 
+    # The subprocess gives no startup signal, so wait for the port instead
+    threading.Thread(target=_open_browser_when_ready, daemon=True).start()
     subprocess.run(
         [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", "8000"],
         cwd=BACKEND_DIR,
     )
 
 
+def _open_browser_when_ready() -> None:
+    """Open the browser once the server subprocess is responding."""
+    import socket
+    import urllib.error
+    import urllib.request
+
+    # Probe the port with short, growing delays (about 40 s in total), then
+    # confirm once over HTTP that the app itself is serving
+    delay = 0.05
+    for _ in range(80):
+        try:
+            socket.create_connection(("127.0.0.1", 8000), timeout=0.2).close()
+            break
+        except OSError:
+            sleep(delay)
+            delay = min(delay * 1.5, 0.5)
+    try:
+        urllib.request.urlopen("http://localhost:8000/health", timeout=2)
+    except (urllib.error.URLError, OSError):
+        pass
+    webbrowser.open("http://localhost:8000")
+
+
+def _serve_in_process() -> bool:
+    """Run uvicorn in this process, reusing the warmed-up imports; False if that is not possible."""
+    backend_imported.wait()
+    try:
+        import uvicorn
+        from app.main import app
+    except ImportError as e:
+        print(f"[!] Kunde inte importera backend ({e}), startar den som separat process.")
+        return False
+
+    class BrowserOpeningServer(uvicorn.Server):
+        """Opens the browser as soon as the server accepts connections."""
+
+        async def startup(self, sockets=None) -> None:
+            await super().startup(sockets=sockets)
+            if self.started:
+                # webbrowser.open may block briefly (e.g. osascript on macOS)
+                asyncio.get_running_loop().run_in_executor(
+                    None, webbrowser.open, "http://localhost:8000"
+                )
+
+    BrowserOpeningServer(uvicorn.Config(app, host="127.0.0.1", port=8000)).run()
+    return True
+
+
 def main() -> None:
-    print("=" * 50)
-    print("  TystText - Lokal transkribering")
-    print("=" * 50)
-    print()
+    sys.stdout.write(BANNER)
+
+    # Importing the backend is CPU-bound and independent of the npm work
+    _prepare_backend_import()
+    threading.Thread(target=_warm_up_backend, daemon=True).start()
 
     build_frontend()
     print()